@@ -1,6 +1,11 @@
 from django.contrib import admin
+from django.db import models
+from django.http import StreamingHttpResponse
 
-from blog.models import Category, Comment, Location, Post
+from blog.export import export_lines
+from blog.forms import LimitedImageField
+from blog.models import Category, Comment, ImageJob, Location, Post
+from blog.search import search_posts
 
 
 class PostInLine(admin.TabularInline):
@@ -20,6 +25,7 @@ class PostAdmin(admin.ModelAdmin):
         "category",
         "is_published",
         "created_at",
+        "comment_count",
     )
     list_editable = (
         "is_published",
@@ -33,6 +39,26 @@ class PostAdmin(admin.ModelAdmin):
     )
     list_display_links = ("title",)
     empty_value_display = "-пусто-"
+    formfield_overrides = {
+        models.ImageField: {"form_class": LimitedImageField},
+    }
+
+    actions = ("export_ndjson",)
+
+    @admin.action(description="Выгрузить в NDJSON")
+    def export_ndjson(self, request, queryset):
+        response = StreamingHttpResponse(
+            export_lines(queryset), content_type="application/x-ndjson"
+        )
+        response["Content-Disposition"] = (
+            'attachment; filename="posts.ndjson"'
+        )
+        return response
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        return search_posts(queryset, search_term), False
 
 
 @admin.register(Category)
@@ -59,3 +85,16 @@ class LocationAdmin(admin.ModelAdmin):
 
 
 admin.site.register(Comment)
+
+
+@admin.register(ImageJob)
+class ImageJobAdmin(admin.ModelAdmin):
+    list_display = (
+        "image",
+        "post",
+        "status",
+        "attempts",
+        "updated_at",
+    )
+    list_filter = ("status",)
+    readonly_fields = ("error",)
@@ -0,0 +1,256 @@
+"""JSON API только для чтения.
+
+Записи выбираются через ``values()`` лишь с запрошенными колонками
+(``?fields=``), связанные автор, категория и местоположение
+подтягиваются тем же запросом (``?embed=``), а страницы листаются
+курсорами ``after``/``before``.
+"""
+from functools import wraps
+
+from django.http import JsonResponse
+from django.views.decorators.http import require_safe
+
+from blog.models import Category, Comment, Location, Post
+from blog.utils import CursorPaginator, read_only_view
+from blogicum import constants
+
+
+class ApiError(Exception):
+    """Ошибка в параметрах запроса к API."""
+
+
+def image_url(name):
+    if not name:
+        return None
+    return Post._meta.get_field("image").storage.url(name)
+
+
+EMBEDS = {
+    "author": {
+        "id": "id",
+        "username": "username",
+        "first_name": "first_name",
+        "last_name": "last_name",
+    },
+    "category": {
+        "id": "id",
+        "title": "title",
+        "slug": "slug",
+    },
+    "location": {
+        "id": "id",
+        "name": "name",
+    },
+}
+
+
+class Resource:
+    """Описание выдачи модели: публичные поля, вложения и порядок.
+
+    ``visibility`` задаёт для связи поле, без которого она отдаётся как
+    ``null``, например снятое с публикации местоположение.
+    """
+
+    def __init__(
+        self,
+        fields,
+        embeds=(),
+        key="id",
+        descending=False,
+        converters=None,
+        visibility=None,
+    ):
+        self.fields = fields
+        self.embeds = embeds
+        self.key = key
+        self.descending = descending
+        self.converters = converters or {}
+        self.visibility = visibility or {}
+
+    def parse_list(self, request, name, allowed):
+        raw = request.GET.get(name)
+        if not raw:
+            return None
+        values = [value.strip() for value in raw.split(",") if value.strip()]
+        unknown = set(values) - set(allowed)
+        if unknown:
+            raise ApiError(
+                f"Неизвестные значения {name}: {', '.join(sorted(unknown))}."
+            )
+        return list(dict.fromkeys(values))
+
+    def columns(self, request):
+        """Пары (имя в ответе, путь для ``values()``)."""
+        fields = self.parse_list(request, "fields", self.fields)
+        embeds = self.parse_list(request, "embed", self.embeds) or []
+        if fields is None:
+            fields = list(self.fields)
+        columns = []
+        for name in fields:
+            lookup = self.fields[name]
+            if name in embeds:
+                columns.extend(
+                    (f"{name}.{field}", f"{name}__{lookup}")
+                    for field, lookup in EMBEDS[name].items()
+                )
+            else:
+                columns.append((name, lookup))
+        return columns
+
+    def serialize(self, row, columns):
+        item = {}
+        for name, lookup in columns:
+            parent = name.split(".", 1)[0]
+            if parent in self.visibility and not row[self.visibility[parent]]:
+                item[parent] = None
+                continue
+            value = row[lookup]
+            if name in self.converters:
+                value = self.converters[name](value)
+            target = item
+            if "." in name:
+                parent, name = name.split(".", 1)
+                if row[f"{parent}_id"] is None:
+                    item[parent] = None
+                    continue
+                target = item.setdefault(parent, {})
+            target[name] = value
+        return item
+
+    def page(self, request, queryset):
+        columns = self.columns(request)
+        lookups = {lookup for _, lookup in columns}
+        lookups.update({"id", self.key})
+        lookups.update(
+            f"{name.split('.')[0]}_id" for name, _ in columns if "." in name
+        )
+        lookups.update(
+            self.visibility[name.split(".")[0]]
+            for name, _ in columns
+            if name.split(".")[0] in self.visibility
+        )
+        try:
+            limit = int(request.GET.get("limit", constants.API_PAGE_SIZE))
+        except ValueError:
+            raise ApiError("Параметр limit должен быть числом.")
+        limit = min(max(limit, 1), constants.API_MAX_PAGE_SIZE)
+        paginator = CursorPaginator(
+            queryset.values(*lookups), limit, self.key, self.descending
+        )
+        page = paginator.get_page(
+            after=request.GET.get("after"), before=request.GET.get("before")
+        )
+        return {
+            "results": [self.serialize(row, columns) for row in page],
+            "next": page_url(request, "after", page.next_cursor),
+            "previous": page_url(request, "before", page.previous_cursor),
+        }
+
+
+def page_url(request, name, cursor):
+    if cursor is None:
+        return None
+    query = request.GET.copy()
+    query.pop("after", None)
+    query.pop("before", None)
+    query[name] = cursor
+    return request.build_absolute_uri(f"{request.path}?{query.urlencode()}")
+
+
+POSTS = Resource(
+    fields={
+        "id": "id",
+        "title": "title",
+        "text": "text",
+        "pub_date": "pub_date",
+        "created_at": "created_at",
+        "image": "image",
+        "comment_count": "comment_count",
+        "author": "author_id",
+        "category": "category_id",
+        "location": "location_id",
+    },
+    embeds=("author", "category", "location"),
+    key="pub_date",
+    descending=True,
+    converters={"image": image_url},
+    visibility={"location": "location__is_published"},
+)
+COMMENTS = Resource(
+    fields={
+        "id": "id",
+        "text": "text",
+        "created_at": "created_at",
+        "author": "author_id",
+        "post": "post_id",
+    },
+    embeds=("author",),
+    key="created_at",
+)
+CATEGORIES = Resource(
+    fields={
+        "id": "id",
+        "title": "title",
+        "description": "description",
+        "slug": "slug",
+    },
+)
+LOCATIONS = Resource(fields={"id": "id", "name": "name"})
+
+
+def api_view(func):
+    """Общее для ресурсов API: только чтение и ошибки в JSON."""
+
+    @wraps(func)
+    def wrapper(request, *args, **kwargs):
+        try:
+            data = func(request, *args, **kwargs)
+        except ApiError as error:
+            return JsonResponse({"error": str(error)}, status=400)
+        if data is None:
+            return JsonResponse({"error": "Не найдено."}, status=404)
+        return JsonResponse(data, json_dumps_params={"ensure_ascii": False})
+
+    return require_safe(read_only_view(wrapper))
+
+
+@api_view
+def post_list(request):
+    """Опубликованные публикации, новые сначала."""
+    posts = Post.objects.published_posts()
+    if request.GET.get("category"):
+        posts = posts.filter(category__slug=request.GET["category"])
+    if request.GET.get("author"):
+        posts = posts.filter(author__username=request.GET["author"])
+    return POSTS.page(request, posts)
+
+
+@api_view
+def post_item(request, post_id):
+    """Одна публикация, видимая пользователю."""
+    page = POSTS.page(
+        request, Post.objects.visible_posts(request.user).filter(id=post_id)
+    )
+    return page["results"][0] if page["results"] else None
+
+
+@api_view
+def comment_list(request, post_id):
+    """Комментарии публикации, от старых к новым."""
+    if not Post.objects.visible_posts(request.user).filter(
+        id=post_id
+    ).exists():
+        return None
+    return COMMENTS.page(request, Comment.objects.filter(post_id=post_id))
+
+
+@api_view
+def category_list(request):
+    """Опубликованные категории."""
+    return CATEGORIES.page(request, Category.objects.filter(is_published=True))
+
+
+@api_view
+def location_list(request):
+    """Опубликованные местоположения."""
+    return LOCATIONS.page(request, Location.objects.filter(is_published=True))
@@ -0,0 +1,91 @@
+from hashlib import md5
+from time import time
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.cache.utils import make_template_fragment_key
+from django.db.models import Min
+from django.utils.timezone import now
+
+from blog.models import Post
+from blogicum import constants
+
+POST_CARD_FRAGMENT = "post_card"
+INVALIDATION_BATCH_SIZE = 500
+PAGE_GENERATION_KEY = "blog:page_generation"
+
+
+def fragment_cache():
+    """Возвращает кэш, которым пользуется тег ``{% cache %}``."""
+    if "template_fragments" in settings.CACHES:
+        return caches["template_fragments"]
+    return caches["default"]
+
+
+def process_local_caches():
+    """Кэши страниц и карточек, которые видны только текущему процессу.
+
+    Сбросы из отдельного процесса, например обработчика очереди картинок,
+    до такого кэша веб-сервера не доходят.
+    """
+    return [
+        backend
+        for backend in (caches["default"], fragment_cache())
+        if isinstance(backend, LocMemCache)
+    ]
+
+
+def forget_post_cards(post_ids):
+    """Удаляет закэшированные карточки публикаций."""
+    cache = fragment_cache()
+    batch = []
+    for post_id in post_ids:
+        batch.append(
+            make_template_fragment_key(POST_CARD_FRAGMENT, [post_id])
+        )
+        if len(batch) == INVALIDATION_BATCH_SIZE:
+            cache.delete_many(batch)
+            batch = []
+    if batch:
+        cache.delete_many(batch)
+
+
+def page_generation():
+    """Возвращает поколение кэша страниц.
+
+    Начальное значение берётся от текущего времени, чтобы после вытеснения
+    счётчика не вернуться к ключам старых страниц.
+    """
+    generation = cache.get(PAGE_GENERATION_KEY)
+    if generation is None:
+        cache.add(PAGE_GENERATION_KEY, int(time() * 1000), None)
+        generation = cache.get(PAGE_GENERATION_KEY)
+    return generation
+
+
+def bump_page_generation():
+    """Делает устаревшими все закэшированные страницы."""
+    try:
+        cache.incr(PAGE_GENERATION_KEY)
+    except ValueError:
+        page_generation()
+
+
+def page_cache_key(request):
+    """Ключ страницы с учётом пути и параметров запроса."""
+    path = md5(request.get_full_path().encode()).hexdigest()
+    return f"blog:page:{page_generation()}:{path}"
+
+
+def page_cache_timeout():
+    """Время жизни страницы до ближайшей отложенной публикации."""
+    next_pub_date = Post.objects.filter(
+        is_published=True, pub_date__gt=now()
+    ).aggregate(next_pub_date=Min("pub_date"))["next_pub_date"]
+    if next_pub_date is None:
+        return constants.PAGE_CACHE_TIMEOUT
+    return min(
+        constants.PAGE_CACHE_TIMEOUT,
+        int((next_pub_date - now()).total_seconds()),
+    )
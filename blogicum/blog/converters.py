@@ -0,0 +1,7 @@
+from django.urls.converters import StringConverter
+
+from blog.feeds import FEED_TYPES
+
+
+class FeedTypeConverter(StringConverter):
+    regex = "|".join(FEED_TYPES)
@@ -0,0 +1,78 @@
+"""Выгрузка данных блога в NDJSON.
+
+Каждая строка — объект в формате ``dumpdata``: ``model``, ``pk`` и
+``fields``. Таблицы читаются порциями по первичному ключу, поэтому память
+не зависит от объёма данных. Пароли и почта пользователей не выгружаются.
+"""
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+from blog.models import Category, Comment, Location, Post, User
+from blogicum import constants
+
+
+def model_fields(model):
+    """Имена конкретных полей модели кроме первичного ключа."""
+    return tuple(
+        field.name
+        for field in model._meta.concrete_fields
+        if not field.primary_key
+    )
+
+
+def dataset(posts=None):
+    """Выгружаемые наборы ``(модель, queryset, поля)`` в порядке связей.
+
+    Без ``posts`` выгружается всё; иначе — эти публикации, их комментарии
+    и то, на что они ссылаются.
+    """
+    users = User.objects.all()
+    categories = Category.objects.all()
+    locations = Location.objects.all()
+    comments = Comment.objects.all()
+    if posts is not None:
+        posts = Post.objects.filter(pk__in=posts.values("pk"))
+        comments = comments.filter(post__in=posts.values("pk"))
+        users = users.filter(
+            Q(pk__in=posts.values("author"))
+            | Q(pk__in=comments.values("author"))
+        )
+        categories = categories.filter(pk__in=posts.values("category"))
+        locations = locations.filter(pk__in=posts.values("location"))
+    else:
+        posts = Post.objects.all()
+    return (
+        (User, users, constants.EXPORT_USER_FIELDS),
+        (Category, categories, model_fields(Category)),
+        (Location, locations, model_fields(Location)),
+        (Post, posts, model_fields(Post)),
+        (Comment, comments, model_fields(Comment)),
+    )
+
+
+def export_chunks(model, queryset, fields, after=0,
+                  chunk_size=constants.EXPORT_CHUNK_SIZE):
+    """Порции строк NDJSON и последний pk в каждой порции."""
+    label = model._meta.label_lower
+    queryset = queryset.order_by("pk").values("pk", *fields)
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    while True:
+        rows = list(queryset.filter(pk__gt=after)[:chunk_size])
+        if not rows:
+            return
+        lines = []
+        for row in rows:
+            pk = row.pop("pk")
+            lines.append(
+                encoder.encode({"model": label, "pk": pk, "fields": row})
+                + "\n"
+            )
+        after = pk
+        yield "".join(lines), after
+
+
+def export_lines(posts=None):
+    """Строки NDJSON для всего набора данных или для выбранных постов."""
+    for model, queryset, fields in dataset(posts):
+        for chunk, _ in export_chunks(model, queryset, fields):
+            yield chunk
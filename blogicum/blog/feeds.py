@@ -0,0 +1,153 @@
+"""RSS- и Atom-ленты публикаций, которые отдаются по мере генерации."""
+from hashlib import md5
+from io import StringIO
+
+from django.core.cache import cache
+from django.http import HttpResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed, Rss201rev2Feed
+from django.utils.xmlutils import SimplerXMLGenerator
+
+from blog.cache import page_cache_timeout, page_generation
+from blogicum import constants
+
+
+class StreamingFeedMixin:
+    """Пишет документ ленты по частям: шапка, записи по одной, концовка.
+
+    Записи берутся из итератора и не накапливаются в ``self.items``.
+    Классы лент определяют ``open_document`` и ``close_document``.
+    """
+
+    item_element = None
+
+    def __init__(self, *args, last_modified=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.last_modified = last_modified
+
+    def latest_post_date(self):
+        return self.last_modified or super().latest_post_date()
+
+    def make_item(self, **kwargs):
+        """Запись в том виде, в котором её собирает ``add_item``."""
+        self.add_item(**kwargs)
+        return self.items.pop()
+
+    def stream(self, items, encoding="utf-8"):
+        buffer = StringIO()
+        handler = SimplerXMLGenerator(
+            buffer, encoding, short_empty_elements=True
+        )
+
+        def flush():
+            chunk = buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            return chunk
+
+        handler.startDocument()
+        self.open_document(handler)
+        yield flush()
+        for item in items:
+            handler.startElement(self.item_element, self.item_attributes(item))
+            self.add_item_elements(handler, item)
+            handler.endElement(self.item_element)
+            yield flush()
+        self.close_document(handler)
+        yield flush()
+
+
+class StreamingRssFeed(StreamingFeedMixin, Rss201rev2Feed):
+    item_element = "item"
+
+    def open_document(self, handler):
+        handler.startElement("rss", self.rss_attributes())
+        handler.startElement("channel", self.root_attributes())
+        self.add_root_elements(handler)
+
+    def close_document(self, handler):
+        self.endChannelElement(handler)
+        handler.endElement("rss")
+
+
+class StreamingAtomFeed(StreamingFeedMixin, Atom1Feed):
+    item_element = "entry"
+
+    def open_document(self, handler):
+        handler.startElement("feed", self.root_attributes())
+        self.add_root_elements(handler)
+
+    def close_document(self, handler):
+        handler.endElement("feed")
+
+
+FEED_TYPES = {
+    "rss": StreamingRssFeed,
+    "atom": StreamingAtomFeed,
+}
+
+
+def feed_cache_key(request, feed_type):
+    """Ключ готовой ленты: ссылки в ней абсолютные, поэтому важен и хост."""
+    url = md5(request.build_absolute_uri().encode()).hexdigest()
+    return f"blog:feed:{feed_type}:{page_generation()}:{url}"
+
+
+def post_items(request, feed, posts):
+    for post in posts.iterator(chunk_size=constants.FEED_CHUNK_SIZE):
+        link = request.build_absolute_uri(
+            reverse("blog:post_detail", args=(post.id,))
+        )
+        yield feed.make_item(
+            title=post.title,
+            link=link,
+            unique_id=link,
+            description=post.text,
+            pubdate=post.pub_date,
+            author_name=post.author.get_full_name() or post.author.username,
+            categories=(post.category.title,) if post.category else None,
+        )
+
+
+def cache_while_streaming(key, chunks, timeout):
+    """Отдаёт части документа и сохраняет его целиком в конце."""
+    document = []
+    for chunk in chunks:
+        document.append(chunk)
+        yield chunk
+    if timeout > 0:
+        cache.set(key, "".join(document), timeout)
+
+
+def feed_response(request, feed_type, posts, title, link, description):
+    """Ответ с лентой ``feed_type`` из публикаций ``posts``.
+
+    Готовый XML кэшируется в поколении кэша страниц и сбрасывается вместе
+    с ним при изменении публикаций.
+    """
+    feed_class = FEED_TYPES[feed_type]
+    content_type = feed_class.content_type
+    key = feed_cache_key(request, feed_type)
+    document = cache.get(key)
+    if document is not None:
+        return HttpResponse(document, content_type=content_type)
+    posts = posts.select_related("author", "category").order_by(
+        "-pub_date", "-id"
+    )
+    feed = feed_class(
+        title=title,
+        link=request.build_absolute_uri(link),
+        description=description,
+        feed_url=request.build_absolute_uri(),
+        language="ru",
+        last_modified=posts.values_list("pub_date", flat=True).first(),
+    )
+    posts = posts[: constants.FEED_ITEMS]
+    return StreamingHttpResponse(
+        cache_while_streaming(
+            key,
+            feed.stream(post_items(request, feed, posts)),
+            page_cache_timeout(),
+        ),
+        content_type=content_type,
+    )
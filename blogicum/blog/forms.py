@@ -1,14 +1,39 @@
-from django.forms import DateTimeInput, ModelForm, Textarea
+from django.core.exceptions import ValidationError
+from django.forms import DateTimeInput, ImageField, ModelForm, Textarea
 
+from blog.images import IncompleteHeader, image_header_error, upload_size_error
 from blog.models import Comment, Post
 
 
+class LimitedImageField(ImageField):
+    """Поле картинки с ограничением размера файла и числа пикселей."""
+
+    def to_python(self, data):
+        if data:
+            error = getattr(data, "upload_error", "") or upload_size_error(
+                data.size
+            )
+            if not error:
+                try:
+                    error = image_header_error(data)
+                except IncompleteHeader:
+                    error = ""
+                finally:
+                    data.seek(0)
+            if error:
+                raise ValidationError(error, code="image_limits")
+        return super().to_python(data)
+
+
 class PostForm(ModelForm):
     """Форма поста."""
 
     class Meta:
         model = Post
         exclude = ("author",)
+        field_classes = {
+            "image": LimitedImageField,
+        }
         widgets = {
             "pub_date": DateTimeInput(
                 format="%Y-%m-%dT%H:%M",
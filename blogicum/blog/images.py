@@ -0,0 +1,173 @@
+from hashlib import md5
+from io import BytesIO
+from pathlib import PurePosixPath
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.template.defaultfilters import filesizeformat
+from PIL import ExifTags, Image, ImageOps, UnidentifiedImageError
+
+from blogicum import constants
+
+
+RENDITIONS_KEY = "blog:renditions:{}"
+
+
+class IncompleteHeader(Exception):
+    """Данных ещё не хватает, чтобы прочитать заголовок картинки."""
+
+
+def upload_size_error(size):
+    """Сообщение об ошибке, если файл больше допустимого."""
+    if size > constants.MAX_IMAGE_SIZE:
+        return (
+            "Размер файла не должен превышать "
+            f"{filesizeformat(constants.MAX_IMAGE_SIZE)}."
+        )
+    return ""
+
+
+def image_header_error(source):
+    """Проверяет размеры картинки по заголовку, не декодируя пиксели."""
+    try:
+        with Image.open(source) as image:
+            width, height = image.size
+    except Image.DecompressionBombError:
+        width = height = constants.MAX_IMAGE_PIXELS
+    except (UnidentifiedImageError, OSError, SyntaxError):
+        raise IncompleteHeader
+    if width * height > constants.MAX_IMAGE_PIXELS:
+        return (
+            "Картинка слишком большая: допускается не более "
+            f"{constants.MAX_IMAGE_PIXELS} пикселей."
+        )
+    return ""
+
+
+def rendition_name(name, kind):
+    """Имя уменьшенной копии рядом с оригиналом."""
+    path = PurePosixPath(name)
+    return str(path.with_name(f"{path.stem}_{kind}.jpg"))
+
+
+def renditions_cache_key(name):
+    return RENDITIONS_KEY.format(md5(name.encode()).hexdigest())
+
+
+def expected_renditions(width):
+    """Копии, которые можно сделать из картинки шириной ``width``.
+
+    Картинки не увеличиваются, поэтому копии шире оригинала не создаются.
+    """
+    return {
+        kind: rendition_width
+        for kind, rendition_width in constants.IMAGE_RENDITIONS.items()
+        if rendition_width <= width
+    }
+
+
+def has_renditions(storage, name):
+    """Проверяет, что для картинки созданы все возможные копии."""
+    with storage.open(name) as source:
+        width, _ = Image.open(source).size
+    return all(
+        storage.exists(rendition_name(name, kind))
+        for kind in expected_renditions(width)
+    )
+
+
+def make_renditions(storage, name):
+    """Создаёт уменьшенные JPEG-копии картинки точно заданной ширины."""
+    with storage.open(name) as source:
+        image = Image.open(source)
+        image.load()
+    image = image.convert("RGB")
+    renditions = expected_renditions(image.width)
+    for kind in constants.IMAGE_RENDITIONS:
+        target = rendition_name(name, kind)
+        if storage.exists(target):
+            storage.delete(target)
+        if kind not in renditions:
+            continue
+        width = renditions[kind]
+        rendition = image.resize(
+            (width, max(1, round(image.height * width / image.width))),
+            Image.Resampling.LANCZOS,
+        )
+        buffer = BytesIO()
+        rendition.save(
+            buffer,
+            "JPEG",
+            quality=constants.IMAGE_RENDITION_QUALITY,
+            optimize=True,
+            progressive=True,
+        )
+        storage.save_derived(target, ContentFile(buffer.getvalue()))
+    cache.set(renditions_cache_key(name), renditions, None)
+    return renditions
+
+
+def normalize_image(storage, name):
+    """Поворачивает картинку по EXIF и сохраняет её без метаданных.
+
+    Картинка, которую поворачивать не нужно, не пересохраняется.
+    """
+    with storage.open(name) as source:
+        image = Image.open(source)
+        image_format = image.format
+        if getattr(image, "is_animated", False) or (
+            image.getexif().get(ExifTags.Base.Orientation, 1) == 1
+        ):
+            return name
+        image.load()
+    image = ImageOps.exif_transpose(image)
+    buffer = BytesIO()
+    if image_format == "JPEG":
+        image.save(buffer, image_format, quality=95)
+    else:
+        image.save(buffer, image_format)
+    return storage.save(name, ContentFile(buffer.getvalue()))
+
+
+def process_image(storage, name):
+    """Полная обработка загруженной картинки."""
+    name = normalize_image(storage, name)
+    make_renditions(storage, name)
+    return name
+
+
+def delete_image(storage, name):
+    """Удаляет картинку вместе с уменьшенными копиями."""
+    for kind in constants.IMAGE_RENDITIONS:
+        storage.delete(rendition_name(name, kind))
+    storage.delete(name)
+    cache.delete(renditions_cache_key(name))
+
+
+def rendition_widths(storage, name):
+    """Готовые копии картинки: ``{вид: ширина}``.
+
+    Результат проверки хранилища кэшируется, чтобы не обращаться к нему
+    при каждой отрисовке карточки.
+    """
+    key = renditions_cache_key(name)
+    widths = cache.get(key)
+    if widths is None:
+        widths = {
+            kind: width
+            for kind, width in constants.IMAGE_RENDITIONS.items()
+            if storage.exists(rendition_name(name, kind))
+        }
+        cache.set(key, widths, constants.PAGE_CACHE_TIMEOUT)
+    return widths
+
+
+def image_srcset(image):
+    """Значение атрибута ``srcset`` из готовых копий картинки."""
+    if not image:
+        return ""
+    storage = image.storage
+    return ", ".join(
+        f"{storage.url(rendition_name(image.name, kind))} {width}w"
+        for kind, width in rendition_widths(storage, image.name).items()
+    )
@@ -0,0 +1,207 @@
+"""Быстрая загрузка данных блога из фикстуры JSON или выгрузки NDJSON.
+
+Объекты вставляются пачками через ``bulk_create`` без сигналов и со
+своими ``created_at``. Пользователи и категории, которые уже есть в базе,
+сопоставляются по ``username`` и ``slug``. Строка, чей pk занят той же
+записью, пропускается, а занятый другой записью — получает новый pk.
+Ссылки на сопоставленные и переназначенные объекты подменяются по
+словарям в памяти.
+"""
+import gzip
+import json
+from collections import Counter, defaultdict
+from datetime import datetime
+
+from django.apps import apps
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Max
+
+from blog.cache import bump_page_generation, forget_post_cards
+from blog.search import index_posts
+from blogicum import constants
+
+IMPORT_ORDER = (
+    "auth.user",
+    "blog.category",
+    "blog.location",
+    "blog.post",
+    "blog.comment",
+)
+NATURAL_KEYS = {
+    "auth.user": "username",
+    "blog.category": "slug",
+}
+# Поля, которые пересчитываются после загрузки и не сравниваются.
+DERIVED_FIELDS = {
+    "blog.post": ("comment_count",),
+}
+
+
+def read_objects(path):
+    """Объекты из фикстуры ``dumpdata`` или NDJSON, можно сжатых gzip.
+
+    Фикстура читается целиком и упорядочивается по ``IMPORT_ORDER``;
+    NDJSON читается построчно и должен быть уже упорядочен, как его
+    пишет ``export_blog``.
+    """
+    opener = gzip.open if str(path).endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as file:
+        head = file.read(64).lstrip()
+        file.seek(0)
+        if head.startswith("["):
+            order = {label: index for index, label in enumerate(IMPORT_ORDER)}
+            yield from sorted(
+                json.load(file),
+                key=lambda obj: order.get(obj["model"], len(order)),
+            )
+            return
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+
+def refresh_derived_data(post_ids, using, reindex=True):
+    """Пересчитывает то, что при обычном сохранении ведут сигналы.
+
+    Счётчики комментариев, поисковый индекс новых публикаций и кэш.
+    """
+    posts = apps.get_model("blog.Post").objects.db_manager(using)
+    posts.sync_comment_counts()
+    post_ids = list(post_ids)
+    for start in range(
+        0, len(post_ids) if reindex else 0, constants.SEARCH_INDEX_BATCH
+    ):
+        batch = post_ids[start:start + constants.SEARCH_INDEX_BATCH]
+        index_posts(
+            posts.filter(pk__in=batch).only("title", "text"), using=using
+        )
+    forget_post_cards(post_ids)
+    bump_page_generation()
+
+
+def dumped_value(field, obj):
+    """Значение поля с той точностью, с какой его сохраняет выгрузка.
+
+    JSON-выгрузки Django пишут время с точностью до миллисекунд.
+    """
+    value = field.value_from_object(obj)
+    if isinstance(value, datetime):
+        value = value.replace(microsecond=value.microsecond // 1000 * 1000)
+    return value
+
+
+class BlogImporter:
+    """Копит объекты по моделям и вставляет их пачками."""
+
+    def __init__(self, using, batch_size=constants.IMPORT_BATCH_SIZE):
+        self.using = using
+        self.batch_size = batch_size
+        self.pk_maps = defaultdict(dict)
+        self.buffer = []
+        self.label = None
+        self.created = Counter()
+        self.skipped = Counter()
+        self.remapped = Counter()
+        self.post_ids = []
+
+    def add(self, obj):
+        label = obj["model"]
+        if label not in IMPORT_ORDER:
+            self.skipped[label] += 1
+            return
+        if label != self.label:
+            self.flush()
+            self.label = label
+        self.buffer.append(self.build(label, obj["pk"], obj["fields"]))
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def build(self, label, pk, fields):
+        model = apps.get_model(label)
+        values = {"pk": pk}
+        for name, value in fields.items():
+            try:
+                field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            if field.many_to_many:
+                continue
+            if field.is_relation:
+                target = field.related_model._meta.label_lower
+                values[field.attname] = self.pk_maps[target].get(value, value)
+            else:
+                values[field.attname] = field.to_python(value)
+        if label == "auth.user" and not values.get("password"):
+            values["password"] = make_password(None)
+        return model(**values)
+
+    def flush(self):
+        if not self.buffer:
+            return
+        objs, self.buffer = self.buffer, []
+        model = type(objs[0])
+        label = model._meta.label_lower
+        key = NATURAL_KEYS.get(label)
+        if key:
+            existing = dict(
+                model.objects.using(self.using)
+                .filter(**{f"{key}__in": [getattr(obj, key) for obj in objs]})
+                .values_list(key, "pk")
+            )
+            new = []
+            for obj in objs:
+                pk = existing.get(getattr(obj, key))
+                if pk is None:
+                    new.append(obj)
+                    continue
+                self.pk_maps[label][obj.pk] = pk
+                self.skipped[label] += 1
+            objs = new
+        objs = self.resolve_taken_pks(model, objs)
+        model.objects.using(self.using).bulk_create(objs)
+        self.created[label] += len(objs)
+        if label == "blog.post":
+            self.post_ids.extend(obj.pk for obj in objs)
+
+    def resolve_taken_pks(self, model, objs):
+        """Разбирается со строками, чей pk в базе уже занят.
+
+        Если в базе та же запись, она не вставляется повторно; иначе
+        строка получает новый pk, и ссылки на неё переназначаются.
+        """
+        label = model._meta.label_lower
+        existing = model.objects.using(self.using).in_bulk(
+            [obj.pk for obj in objs]
+        )
+        if not existing:
+            return objs
+        fields = [
+            field
+            for field in model._meta.concrete_fields
+            if not field.primary_key
+            and field.name not in DERIVED_FIELDS.get(label, ())
+        ]
+        next_pk = max(
+            model.objects.using(self.using).aggregate(last=Max("pk"))["last"],
+            max(obj.pk for obj in objs),
+        ) + 1
+        new = []
+        for obj in objs:
+            row = existing.get(obj.pk)
+            if row is None:
+                new.append(obj)
+            elif all(
+                dumped_value(field, row) == dumped_value(field, obj)
+                for field in fields
+            ):
+                self.skipped[label] += 1
+            else:
+                self.pk_maps[label][obj.pk] = obj.pk = next_pk
+                next_pk += 1
+                self.remapped[label] += 1
+                new.append(obj)
+        return new
+
+    def tables(self):
+        return [apps.get_model(label)._meta.db_table for label in IMPORT_ORDER]
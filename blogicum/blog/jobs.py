@@ -0,0 +1,60 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils.timezone import now
+
+from blog.cache import bump_page_generation, forget_post_cards
+from blog.models import ImageJob, Post
+from blogicum import constants
+
+
+def enqueue_image(post):
+    """Ставит картинку публикации в очередь на обработку."""
+    return ImageJob.objects.create(post=post, image=post.image.name)
+
+
+def claim_jobs(limit):
+    """Забирает задания из очереди, включая зависшие."""
+    stale = now() - timedelta(seconds=constants.IMAGE_JOB_TIMEOUT)
+    waiting = Q(status=ImageJob.PENDING) | Q(
+        status=ImageJob.RUNNING, updated_at__lt=stale
+    )
+    claimed = []
+    for job in ImageJob.objects.filter(waiting)[:limit]:
+        taken = ImageJob.objects.filter(
+            waiting, pk=job.pk, status=job.status
+        ).update(
+            status=ImageJob.RUNNING,
+            attempts=F("attempts") + 1,
+            updated_at=now(),
+        )
+        if taken:
+            job.attempts += 1
+            claimed.append(job)
+    return claimed
+
+
+def finish_job(job, name=None, error=""):
+    """Сохраняет результат обработки картинки."""
+    if error:
+        job.status = (
+            ImageJob.PENDING
+            if job.attempts < constants.IMAGE_JOB_MAX_ATTEMPTS
+            else ImageJob.FAILED
+        )
+        job.error = error
+        job.save(update_fields=("status", "error", "updated_at"))
+        return
+    if name and name != job.image:
+        Post.objects.filter(pk=job.post_id, image=job.image).update(
+            image=name
+        )
+        transaction.on_commit(
+            lambda: Post.objects.release_image(job.image)
+        )
+    job.status = ImageJob.DONE
+    job.error = ""
+    job.save(update_fields=("status", "error", "updated_at"))
+    forget_post_cards([job.post_id])
+    bump_page_generation()
@@ -0,0 +1,70 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.models import Post
+from blogicum import constants
+
+
+class Command(BaseCommand):
+    help = (
+        "Выводит планы и время запросов лент публикаций. Запустите до и "
+        "после `migrate blog 0004`, чтобы сравнить работу индексов."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=20,
+            help="Сколько раз выполнить каждый запрос для замера времени.",
+        )
+
+    def access_paths(self):
+        """Возвращает запросы страниц блога в том виде, как их строят view."""
+        related = ("author", "category", "location")
+        feed = (
+            Post.objects.published_posts()
+            .select_related(*related)
+            .order_by("-pub_date")
+        )
+        sample = Post.objects.select_related("author", "category").first()
+        if sample is None:
+            return [("Главная", feed)]
+        return [
+            ("Главная", feed),
+            (
+                "Страница пользователя",
+                Post.objects.get_user_posts(sample.author)
+                .select_related(*related)
+                .order_by("-pub_date"),
+            ),
+            (
+                "Страница категории",
+                Post.objects.select_related(*related)
+                .filter(
+                    is_published=True,
+                    pub_date__lte=timezone.now(),
+                    category=sample.category,
+                )
+                .order_by("-pub_date"),
+            ),
+            (
+                "Комментарии публикации",
+                sample.comments.select_related("author")
+                .order_by("created_at", "pk"),
+            ),
+        ]
+
+    def handle(self, *args, **options):
+        repeat = max(options["repeat"], 1)
+        for title, queryset in self.access_paths():
+            page = queryset[: constants.POSTS_BY_PAGE]
+            self.stdout.write(self.style.MIGRATE_HEADING(title))
+            self.stdout.write(page.explain())
+            started = perf_counter()
+            for _ in range(repeat):
+                list(page.all())
+            elapsed = (perf_counter() - started) / repeat * 1000
+            self.stdout.write(f"Среднее время: {elapsed:.2f} мс\n")
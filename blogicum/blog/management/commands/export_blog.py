@@ -0,0 +1,107 @@
+import gzip
+import json
+import os
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.export import dataset, export_chunks
+from blogicum import constants
+
+
+class Command(BaseCommand):
+    help = (
+        "Выгружает пользователей, категории, местоположения, публикации и "
+        "комментарии в NDJSON. С --checkpoint прерванную выгрузку можно "
+        "продолжить с того же места."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            default="-",
+            help="Файл для выгрузки; по умолчанию стандартный вывод.",
+        )
+        parser.add_argument(
+            "--gzip",
+            action="store_true",
+            help="Сжимать выгрузку gzip.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=constants.EXPORT_CHUNK_SIZE,
+            help="Сколько строк читать из базы за один запрос.",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            help="Файл с позицией выгрузки для продолжения после сбоя.",
+        )
+
+    def read_checkpoint(self, path):
+        try:
+            with open(path) as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return None
+
+    def write_checkpoint(self, path, state):
+        temporary = f"{path}.tmp"
+        with open(temporary, "w") as file:
+            json.dump(state, file)
+        os.replace(temporary, path)
+
+    def open_output(self, path, offset):
+        if path == "-":
+            return sys.stdout.buffer
+        if offset is None:
+            return open(path, "wb")
+        output = open(path, "r+b")
+        # Всё, что записано после последней контрольной точки, пишется
+        # заново.
+        output.truncate(offset)
+        output.seek(offset)
+        return output
+
+    def handle(self, *args, **options):
+        checkpoint = options["checkpoint"]
+        if checkpoint and options["output"] == "-":
+            raise CommandError("Для --checkpoint нужен файл в --output.")
+        state = self.read_checkpoint(checkpoint) if checkpoint else None
+        sets = dataset()
+        labels = [model._meta.label_lower for model, _, _ in sets]
+        start = labels.index(state["model"]) if state else 0
+        output = self.open_output(
+            options["output"], state["offset"] if state else None
+        )
+        total = 0
+        try:
+            for model, queryset, fields in sets[start:]:
+                label = model._meta.label_lower
+                after = state["pk"] if state and state["model"] == label else 0
+                for chunk, after in export_chunks(
+                    model, queryset, fields, after, options["chunk_size"]
+                ):
+                    data = chunk.encode()
+                    if options["gzip"]:
+                        # Каждая порция — отдельный член gzip, поэтому файл
+                        # остаётся целым при продолжении выгрузки.
+                        data = gzip.compress(data)
+                    output.write(data)
+                    output.flush()
+                    total += chunk.count("\n")
+                    if checkpoint:
+                        self.write_checkpoint(
+                            checkpoint,
+                            {
+                                "model": label,
+                                "pk": after,
+                                "offset": output.tell(),
+                            },
+                        )
+        finally:
+            if output is not sys.stdout.buffer:
+                output.close()
+        if checkpoint and os.path.exists(checkpoint):
+            os.remove(checkpoint)
+        self.stderr.write(f"Выгружено объектов: {total}")
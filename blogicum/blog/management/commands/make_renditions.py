@@ -0,0 +1,63 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from blog.images import has_renditions, make_renditions
+from blog.models import Post
+
+
+def render_image(job):
+    """Готовит копии одной картинки в дочернем процессе."""
+    name, force = job
+    storage = Post._meta.get_field("image").storage
+    try:
+        if not force and has_renditions(storage, name):
+            return name, False, ""
+        make_renditions(storage, name)
+    except (OSError, ValueError) as error:
+        return name, False, str(error)
+    return name, True, ""
+
+
+class Command(BaseCommand):
+    help = "Создаёт уменьшенные копии уже загруженных картинок публикаций."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=os.cpu_count(),
+            help="Число процессов для обработки картинок.",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Пересоздать копии, даже если они уже есть.",
+        )
+
+    def handle(self, *args, **options):
+        jobs = [
+            (name, options["force"])
+            for name in Post.objects.exclude(image="")
+            .order_by("image")
+            .values_list("image", flat=True)
+            .distinct()
+        ]
+        # Дочерние процессы не должны наследовать открытые соединения с БД.
+        connections.close_all()
+        created = failed = 0
+        with ProcessPoolExecutor(max_workers=options["processes"]) as pool:
+            for name, done, error in pool.map(
+                render_image, jobs, chunksize=16
+            ):
+                if error:
+                    failed += 1
+                    self.stderr.write(f"{name}: {error}")
+                created += done
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Обработано картинок: {created}, ошибок: {failed}"
+            )
+        )
@@ -0,0 +1,70 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from time import sleep
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from blog.cache import process_local_caches
+from blog.images import process_image
+from blog.jobs import claim_jobs, finish_job
+from blog.models import Post
+
+
+def run_job(name):
+    """Обрабатывает картинку в дочернем процессе без обращения к БД."""
+    storage = Post._meta.get_field("image").storage
+    try:
+        return process_image(storage, name), ""
+    except (OSError, ValueError) as error:
+        return name, str(error) or type(error).__name__
+
+
+class Command(BaseCommand):
+    help = "Обрабатывает очередь картинок публикаций в пуле процессов."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=os.cpu_count(),
+            help="Число процессов для обработки картинок.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=2.0,
+            help="Пауза в секундах, если очередь пуста.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Разобрать очередь и завершиться.",
+        )
+
+    def handle(self, *args, **options):
+        if process_local_caches():
+            # Иначе карточки, страницы и ETag остаются со старой картинкой.
+            raise CommandError(
+                "Обработчику очереди нужен кэш, общий с веб-сервером: "
+                "задайте DJANGO_CACHE_BACKEND и DJANGO_CACHE_LOCATION, "
+                "например Memcached, Redis или файловый кэш."
+            )
+        processes = options["processes"]
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            while True:
+                jobs = claim_jobs(processes * 4)
+                if not jobs:
+                    if options["once"]:
+                        return
+                    sleep(options["interval"])
+                    continue
+                # Дочерние процессы не должны наследовать соединения с БД.
+                connections.close_all()
+                results = pool.map(run_job, [job.image for job in jobs])
+                for job, (name, error) in zip(jobs, results):
+                    finish_job(job, name=name, error=error)
+                    if error:
+                        self.stderr.write(f"{job.image}: {error}")
+                    else:
+                        self.stdout.write(f"{job.image}: готово")
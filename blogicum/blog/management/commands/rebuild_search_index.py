@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog.models import Post
+from blog.search import clear_index, index_posts
+from blogicum import constants
+
+
+class Command(BaseCommand):
+    help = "Заново строит поисковый индекс публикаций."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=constants.SEARCH_INDEX_BATCH,
+            help="Сколько публикаций индексировать за одну транзакцию.",
+        )
+
+    def handle(self, *args, **options):
+        clear_index()
+        last_pk, total = 0, 0
+        while True:
+            posts = list(
+                Post.objects.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .only("title", "text")[: options["batch_size"]]
+            )
+            if not posts:
+                break
+            with transaction.atomic():
+                index_posts(posts)
+            last_pk = posts[-1].pk
+            total += len(posts)
+        self.stdout.write(f"Проиндексировано публикаций: {total}")
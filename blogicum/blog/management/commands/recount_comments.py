@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = "Сверяет счётчики комментариев публикаций с таблицей комментариев."
+
+    def handle(self, *args, **options):
+        fixed = Post.objects.sync_comment_counts()
+        self.stdout.write(
+            self.style.SUCCESS(f"Исправлено счётчиков: {fixed}")
+        )
@@ -0,0 +1,193 @@
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import Max
+from django.utils.timezone import now
+
+from blog.importer import refresh_derived_data
+from blog.models import Category, Comment, Location, Post, User
+from blog.seeding import (
+    chunks,
+    comment_rows,
+    init_comment_worker,
+    post_rows,
+    sentence,
+)
+from blog.utils import explicit_created_at
+
+
+def next_pk(model):
+    return (model.objects.aggregate(last=Max("pk"))["last"] or 0) + 1
+
+
+class Command(BaseCommand):
+    help = (
+        "Заполняет базу синтетическими пользователями, категориями, "
+        "местоположениями, публикациями и комментариями для нагрузочных "
+        "тестов. При одинаковом --seed данные совпадают."
+    )
+
+    def add_arguments(self, parser):
+        for name, default in (
+            ("users", 100),
+            ("categories", 10),
+            ("locations", 50),
+            ("posts", 10_000),
+            ("comments", 100_000),
+        ):
+            parser.add_argument(
+                f"--{name}",
+                type=int,
+                default=default,
+                help=f"Сколько создать: {name}.",
+            )
+        parser.add_argument(
+            "--future-share",
+            type=float,
+            default=0.05,
+            help="Доля отложенных публикаций с датой в будущем.",
+        )
+        parser.add_argument("--seed", type=int, default=1)
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=os.cpu_count(),
+            help="Число процессов, генерирующих публикации и комментарии.",
+        )
+        parser.add_argument(
+            "--skip-search-index",
+            action="store_true",
+            help="Не индексировать созданные публикации для поиска.",
+        )
+
+    def seed_references(self, rng, anchor, options):
+        """Создаёт справочные записи и возвращает их диапазоны pk."""
+        password = make_password(None)
+        ranges = []
+        for model, total, build in (
+            (
+                User,
+                options["users"],
+                lambda pk: User(
+                    pk=pk,
+                    username=f"seed{pk}",
+                    first_name=sentence(rng, 1, 1),
+                    password=password,
+                    date_joined=anchor,
+                ),
+            ),
+            (
+                Category,
+                options["categories"],
+                lambda pk: Category(
+                    pk=pk,
+                    title=sentence(rng, 1, 3),
+                    description=sentence(rng, 5, 15),
+                    slug=f"seed-{pk}",
+                    is_published=rng.random() < 0.9,
+                    created_at=anchor,
+                ),
+            ),
+            (
+                Location,
+                options["locations"],
+                lambda pk: Location(
+                    pk=pk,
+                    name=sentence(rng, 1, 3),
+                    created_at=anchor,
+                ),
+            ),
+        ):
+            first = next_pk(model)
+            model.objects.bulk_create(
+                [build(pk) for pk in range(first, first + total)]
+            )
+            ranges.append((first, first + total - 1))
+        return ranges
+
+    def insert(self, model, pool, function, tasks):
+        started, total = perf_counter(), 0
+        for rows in pool.map(function, tasks):
+            with transaction.atomic():
+                model.objects.bulk_create(model(**row) for row in rows)
+            total += len(rows)
+        elapsed = perf_counter() - started
+        self.stdout.write(
+            f"{model._meta.verbose_name_plural}: {total} за {elapsed:.1f} с "
+            f"({total / max(elapsed, 1e-6):.0f} в секунду)"
+        )
+
+    def handle(self, *args, **options):
+        if options["posts"] and not (
+            options["users"] and options["categories"]
+        ):
+            raise CommandError(
+                "Для публикаций нужны пользователи и категории."
+            )
+        if options["comments"] and not options["posts"]:
+            raise CommandError("Для комментариев нужны публикации.")
+        seed = options["seed"]
+        anchor = now().replace(hour=0, minute=0, second=0, microsecond=0)
+        with explicit_created_at(Category, Location, Post, Comment):
+            with transaction.atomic():
+                users, categories, locations = self.seed_references(
+                    random.Random(seed), anchor, options
+                )
+            if not options["locations"]:
+                locations = (None, None)
+            first_post = next_pk(Post)
+            posts = (first_post, first_post + options["posts"] - 1)
+            first_comment = next_pk(Comment)
+            # Дочерние процессы не должны наследовать соединения с БД.
+            connections.close_all()
+            with ProcessPoolExecutor(options["processes"]) as pool:
+                self.insert(Post, pool, post_rows, [
+                    (
+                        seed,
+                        chunk,
+                        (users, categories, locations),
+                        anchor,
+                        options["future_share"],
+                    )
+                    for chunk in chunks(first_post, options["posts"])
+                ])
+            # Комментарии достаются только вышедшим к anchor публикациям.
+            published = list(
+                Post.objects.filter(
+                    pk__range=posts, pub_date__lte=anchor
+                ).order_by("pk").values_list("pk", "pub_date")
+            )
+            if options["comments"] and not published:
+                self.stdout.write(
+                    "Комментарии не созданы: нет вышедших публикаций."
+                )
+            elif options["comments"]:
+                connections.close_all()
+                with ProcessPoolExecutor(
+                    options["processes"],
+                    initializer=init_comment_worker,
+                    initargs=(seed, published),
+                ) as pool:
+                    self.insert(Comment, pool, comment_rows, [
+                        (seed, chunk, users, anchor)
+                        for chunk in chunks(
+                            first_comment, options["comments"]
+                        )
+                    ])
+        started = perf_counter()
+        refresh_derived_data(
+            range(posts[0], posts[1] + 1),
+            DEFAULT_DB_ALIAS,
+            reindex=not options["skip_search_index"],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Счётчики и поисковый индекс обновлены за "
+                f"{perf_counter() - started:.1f} с"
+            )
+        )
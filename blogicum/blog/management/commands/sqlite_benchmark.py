@@ -0,0 +1,134 @@
+from statistics import median
+from threading import Event, Lock, Thread
+from time import perf_counter, sleep
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections
+from django.db import transaction
+
+from blog.models import Comment, Post
+from blogicum import constants
+from blogicum.routers import READ_ONLY_ALIAS, reading_from
+
+
+def percentile(values, share):
+    """Значение, ниже которого лежит доля ``share`` замеров."""
+    if not values:
+        return 0
+    values = sorted(values)
+    return values[min(int(len(values) * share), len(values) - 1)]
+
+
+class Stats:
+    """Замеры одной роли, общие для нескольких потоков."""
+
+    def __init__(self):
+        self.lock = Lock()
+        self.timings = []
+        self.errors = 0
+
+    def measure(self, operation):
+        started = perf_counter()
+        try:
+            operation()
+        except OperationalError:
+            with self.lock:
+                self.errors += 1
+            return
+        elapsed = (perf_counter() - started) * 1000
+        with self.lock:
+            self.timings.append(elapsed)
+
+
+class Command(BaseCommand):
+    help = (
+        "Нагружает базу несколькими читателями ленты и одним писателем "
+        "комментариев и выводит пропускную способность и задержки."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--readers",
+            type=int,
+            default=8,
+            help="Число потоков, читающих ленту.",
+        )
+        parser.add_argument(
+            "--seconds",
+            type=float,
+            default=10.0,
+            help="Длительность теста в секундах.",
+        )
+
+    def read_feed(self):
+        list(
+            Post.objects.published_posts()
+            .select_related("author", "category", "location")
+            .order_by("-pub_date")[: constants.POSTS_BY_PAGE]
+        )
+
+    def reader(self, alias, stop, stats):
+        try:
+            with reading_from(alias):
+                while not stop.is_set():
+                    stats.measure(self.read_feed)
+        finally:
+            connections.close_all()
+
+    def writer(self, post, stop, stats, created):
+        def write_comment():
+            with transaction.atomic():
+                comment = Comment.objects.create(
+                    post=post, author=post.author, text="sqlite_benchmark"
+                )
+            created.append(comment.pk)
+
+        try:
+            while not stop.is_set():
+                stats.measure(write_comment)
+        finally:
+            connections.close_all()
+
+    def handle(self, *args, **options):
+        post = Post.objects.published_posts().select_related("author").first()
+        if post is None:
+            raise CommandError("Нет опубликованных публикаций для теста.")
+        alias = (
+            READ_ONLY_ALIAS
+            if READ_ONLY_ALIAS in settings.DATABASES
+            else DEFAULT_DB_ALIAS
+        )
+        self.stdout.write(f"Читатели используют базу «{alias}».")
+        # Потоки открывают собственные соединения.
+        connections.close_all()
+        stop = Event()
+        reads, writes, created = Stats(), Stats(), []
+        threads = [
+            Thread(target=self.reader, args=(alias, stop, reads))
+            for _ in range(options["readers"])
+        ]
+        threads.append(
+            Thread(target=self.writer, args=(post, stop, writes, created))
+        )
+        for thread in threads:
+            thread.start()
+        sleep(options["seconds"])
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        for title, stats in (("Чтение", reads), ("Запись", writes)):
+            self.stdout.write(
+                f"{title}: {len(stats.timings)} операций, "
+                f"{len(stats.timings) / options['seconds']:.1f} в секунду, "
+                f"медиана {median(stats.timings or [0]):.2f} мс, "
+                f"p95 {percentile(stats.timings, 0.95):.2f} мс, "
+                f"ошибок блокировки {stats.errors}"
+            )
+        if created:
+            Comment.objects.filter(
+                post=post,
+                text="sqlite_benchmark",
+                pk__range=(min(created), max(created)),
+            ).delete()
@@ -1,22 +1,59 @@
-from django.db.models import Manager, Q
+from django.db.models import Count, Manager, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from django.utils.timezone import now
 
+from blog.images import delete_image
+
 
 class PostManager(Manager):
     """Менеджер фильтрующий запрос к БД."""
 
-    def published_posts(self):
-        """Возвращает опубликованные посты."""
-        return self.filter(
+    @staticmethod
+    def published_filter():
+        """Условие, под которое попадают опубликованные посты."""
+        return (
             Q(is_published=True)
             & Q(pub_date__lte=now())
             & Q(category__is_published=True)
         )
 
+    def published_posts(self):
+        """Возвращает опубликованные посты."""
+        return self.filter(self.published_filter())
+
+    def visible_posts(self, user):
+        """Возвращает опубликованные посты и все посты пользователя."""
+        return self.filter(self.published_filter() | Q(author_id=user.id))
+
     def get_user_posts(self, user=None):
-        """Возвращает посты в зависимости от источника запроса."""
-        return self.filter(
-            Q(author=user) | ~Q(is_published=True)
+        """Возвращает все посты автора, в том числе снятые и отложенные.
+
+        Условие только по автору обслуживает индекс ``post_author_feed_idx``.
+        """
+        return self.filter(author=user)
+
+    def release_image(self, name):
+        """Удаляет файл картинки, если на него не ссылается ни один пост."""
+        if not name or self.filter(image=name).exists():
+            return False
+        delete_image(self.model._meta.get_field("image").storage, name)
+        return True
+
+    def sync_comment_counts(self):
+        """Пересчитывает счётчики комментариев, вернувшие расхождение."""
+        comments = self.model._meta.get_field("comments").related_model
+        actual = Coalesce(
+            Subquery(
+                comments.objects.filter(post=OuterRef("pk"))
+                .order_by()
+                .values("post")
+                .annotate(total=Count("pk"))
+                .values("total")
+            ),
+            0,
+        )
+        return self.exclude(comment_count=actual).update(
+            comment_count=actual
         )
 
 
@@ -0,0 +1,54 @@
+# Generated by Django 3.2.16 on 2026-10-18 02:41
+
+from django.db import OperationalError, migrations, models
+import django.db.models.deletion
+
+# Имя таблицы FTS5 совпадает с blog.search.FTS_TABLE. Код приложения сюда
+# не импортируется: миграция должна работать и после его изменений.
+# Индекс для уже существующих публикаций строит rebuild_search_index.
+FTS_TABLE = 'blog_post_fts'
+
+
+def create_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    try:
+        schema_editor.execute(
+            f'CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(title, text)'
+        )
+    except OperationalError:
+        # SQLite собран без FTS5: поиск будет работать через PostTerm.
+        pass
+
+
+def drop_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0006_post_image_storage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64, verbose_name='Основа слова')),
+                ('weight', models.PositiveIntegerField(default=1, verbose_name='Вес')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_terms', to='blog.post', verbose_name='Публикация')),
+            ],
+            options={
+                'verbose_name': 'слово поискового индекса',
+                'verbose_name_plural': 'Поисковый индекс',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='postterm',
+            constraint=models.UniqueConstraint(fields=('term', 'post'), name='postterm_term_post_uniq'),
+        ),
+        migrations.RunPython(create_fts_table, drop_fts_table),
+    ]
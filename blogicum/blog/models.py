@@ -1,7 +1,8 @@
 from django.contrib.auth import get_user_model
 from django.db import models
 
-from blog import managers
+from blog import images, managers
+from blog.storage import post_image_storage
 from blogicum import constants
 
 User = get_user_model()
@@ -62,17 +63,43 @@ class Post(PublishedModel):
     image = models.ImageField(
         verbose_name="Картинка публикации",
         upload_to="post_images",
+        storage=post_image_storage,
         blank=True,
+        db_index=True,
+    )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name="Количество комментариев",
     )
 
     class Meta:
         verbose_name = "публикация"
         verbose_name_plural = "Публикации"
         ordering = ("-pub_date",)
+        indexes = (
+            models.Index(
+                fields=("-pub_date", "-id"),
+                condition=models.Q(is_published=True),
+                name="post_feed_idx",
+            ),
+            models.Index(
+                fields=("author", "-pub_date", "-id"),
+                name="post_author_feed_idx",
+            ),
+            models.Index(
+                fields=("category", "-pub_date", "-id"),
+                condition=models.Q(is_published=True),
+                name="post_category_feed_idx",
+            ),
+        )
 
     def __str__(self):
         return self.title[: constants.MAX_TITLE_LENGTH]
 
+    def image_srcset(self):
+        return images.image_srcset(self.image)
+
 
 class Category(PublishedModel):
     objects = managers.CategoryManager()
@@ -141,9 +168,105 @@ class Comment(models.Model):
         verbose_name = "комментарий"
         verbose_name_plural = "Комментарии"
         ordering = ("created_at",)
+        indexes = (
+            models.Index(
+                fields=("post", "created_at", "id"),
+                name="comment_post_created_idx",
+            ),
+        )
 
     def __str__(self):
         return (
             f"{self.author}: "
             f"{self.text[:constants.MAX_DESCRIPTION_LENGTH]}"
         )
+
+
+class ImageJob(models.Model):
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    STATUSES = (
+        (PENDING, "В очереди"),
+        (RUNNING, "Обрабатывается"),
+        (DONE, "Готово"),
+        (FAILED, "Ошибка"),
+    )
+
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        verbose_name="Публикация",
+        related_name="image_jobs",
+    )
+    image = models.CharField(
+        max_length=constants.MAX_FIELD_LENGTH,
+        verbose_name="Файл картинки",
+    )
+    status = models.CharField(
+        max_length=constants.IMAGE_JOB_STATUS_LENGTH,
+        choices=STATUSES,
+        default=PENDING,
+        verbose_name="Статус",
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name="Попыток",
+    )
+    error = models.TextField(
+        blank=True,
+        verbose_name="Ошибка",
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="Добавлено",
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name="Изменено",
+    )
+
+    class Meta:
+        verbose_name = "обработка картинки"
+        verbose_name_plural = "Обработка картинок"
+        ordering = ("created_at",)
+        indexes = (
+            models.Index(
+                fields=("status", "created_at"),
+                name="imagejob_queue_idx",
+            ),
+        )
+
+    def __str__(self):
+        return f"{self.image}: {self.get_status_display()}"
+
+
+class PostTerm(models.Model):
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        verbose_name="Публикация",
+        related_name="search_terms",
+    )
+    term = models.CharField(
+        max_length=constants.SEARCH_TERM_LENGTH,
+        verbose_name="Основа слова",
+    )
+    weight = models.PositiveIntegerField(
+        default=1,
+        verbose_name="Вес",
+    )
+
+    class Meta:
+        verbose_name = "слово поискового индекса"
+        verbose_name_plural = "Поисковый индекс"
+        constraints = (
+            models.UniqueConstraint(
+                fields=("term", "post"),
+                name="postterm_term_post_uniq",
+            ),
+        )
+
+    def __str__(self):
+        return f"{self.term}: {self.post_id}"
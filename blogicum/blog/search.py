@@ -0,0 +1,208 @@
+"""Полнотекстовый поиск по публикациям.
+
+Текст разбивается на слова, сводится к основам стеммером Портера для
+русского языка и хранится в инвертированном индексе: в таблице FTS5, если
+SQLite её поддерживает, или в модели ``PostTerm``.
+"""
+import re
+from collections import Counter
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Count, Sum
+
+from blogicum import constants
+
+FTS_TABLE = "blog_post_fts"
+WORD = re.compile(r"\w+")
+CYRILLIC = re.compile(r"[а-я]")
+
+STOP_WORDS = frozenset(
+    "а без более бы был была были было быть в вам вас весь во вот все всех "
+    "вы где да даже для до его ее если есть еще же за здесь и из или им их "
+    "к как ко когда кто ли либо мне может мы на над надо наш не него нее "
+    "нет ни них но ну о об однако он она они оно от очень по под при про "
+    "с со так также такой там те тем то того тоже той только том ты у уже "
+    "хотя чего чей чем что чтобы чье чья эта эти это этого этой этом этот я"
+    .split()
+)
+
+RV = re.compile(r"^(.*?[аеиоуыэюя])(.*)$")
+PERFECTIVE_GERUND = re.compile(
+    r"((ив|ивши|ившись|ыв|ывши|ывшись)|((?<=[ая])(в|вши|вшись)))$"
+)
+REFLEXIVE = re.compile(r"(с[яь])$")
+ADJECTIVE = re.compile(
+    r"(ее|ие|ые|ое|ими|ыми|ей|ий|ый|ой|ем|им|ым|ом|его|ого|ему|ому|их|ых|"
+    r"ую|юю|ая|яя|ою|ею)$"
+)
+PARTICIPLE = re.compile(r"((ивш|ывш|ующ)|((?<=[ая])(ем|нн|вш|ющ|щ)))$")
+VERB = re.compile(
+    r"((ила|ыла|ена|ейте|уйте|ите|или|ыли|ей|уй|ил|ыл|им|ым|ен|ило|ыло|ено|"
+    r"ят|ует|уют|ит|ыт|ены|ить|ыть|ишь|ую|ю)|"
+    r"((?<=[ая])(ла|на|ете|йте|ли|й|л|ем|н|ло|но|ет|ют|ны|ть|ешь|нно)))$"
+)
+NOUN = re.compile(
+    r"(а|ев|ов|ие|ье|е|иями|ями|ами|еи|ии|и|ией|ей|ой|ий|й|иям|ям|ием|ем|"
+    r"ам|ом|о|у|ах|иях|ях|ы|ь|ию|ью|ю|ия|ья|я)$"
+)
+DERIVATIONAL_CONTEXT = re.compile(r".*[^аеиоуыэюя]+[аеиоуыэюя].*ость?$")
+DERIVATIONAL = re.compile(r"ость?$")
+SUPERLATIVE = re.compile(r"(ейше|ейш)$")
+
+
+def stem(word):
+    """Основа русского слова по алгоритму Портера (Snowball)."""
+    match = RV.match(word)
+    if match is None:
+        return word
+    prefix, rv = match.groups()
+    stripped = PERFECTIVE_GERUND.sub("", rv, 1)
+    if stripped != rv:
+        rv = stripped
+    else:
+        rv = REFLEXIVE.sub("", rv, 1)
+        stripped = ADJECTIVE.sub("", rv, 1)
+        if stripped != rv:
+            rv = PARTICIPLE.sub("", stripped, 1)
+        else:
+            stripped = VERB.sub("", rv, 1)
+            rv = NOUN.sub("", rv, 1) if stripped == rv else stripped
+    if rv.endswith("и"):
+        rv = rv[:-1]
+    if DERIVATIONAL_CONTEXT.match(rv):
+        rv = DERIVATIONAL.sub("", rv, 1)
+    if rv.endswith("ь"):
+        rv = rv[:-1]
+    else:
+        rv = SUPERLATIVE.sub("", rv, 1)
+        if rv.endswith("нн"):
+            rv = rv[:-1]
+    return prefix + rv
+
+
+def tokenize(text):
+    """Основы значимых слов текста в порядке появления."""
+    terms = []
+    for word in WORD.findall(text.lower().replace("ё", "е")):
+        if word in STOP_WORDS or len(word) < 2:
+            continue
+        if CYRILLIC.search(word):
+            word = stem(word)
+        terms.append(word[: constants.SEARCH_TERM_LENGTH])
+    return terms
+
+
+def document_terms(post):
+    """Веса основ публикации; слова заголовка весят больше слов текста."""
+    weights = Counter(tokenize(post.text))
+    for term in tokenize(post.title):
+        weights[term] += constants.SEARCH_TITLE_WEIGHT
+    return weights
+
+
+_fts_tables = {}
+
+
+def fts_enabled(using=DEFAULT_DB_ALIAS):
+    """Есть ли в базе ``using`` таблица FTS5 для поиска."""
+    connection = connections[using]
+    key = (using, str(connection.settings_dict["NAME"]))
+    if key not in _fts_tables:
+        _fts_tables[key] = (
+            connection.vendor == "sqlite"
+            and FTS_TABLE in connection.introspection.table_names()
+        )
+    return _fts_tables[key]
+
+
+def index_posts(posts, using=DEFAULT_DB_ALIAS):
+    """Заменяет записи индекса для переданных публикаций."""
+    from blog.models import PostTerm
+
+    posts = list(posts)
+    ids = [post.pk for post in posts]
+    if not ids:
+        return
+    if fts_enabled(using):
+        with connections[using].cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {FTS_TABLE} WHERE rowid IN "
+                f"({', '.join(['%s'] * len(ids))})",
+                ids,
+            )
+            cursor.executemany(
+                f"INSERT INTO {FTS_TABLE} (rowid, title, text) "
+                "VALUES (%s, %s, %s)",
+                [
+                    (
+                        post.pk,
+                        " ".join(tokenize(post.title)),
+                        " ".join(tokenize(post.text)),
+                    )
+                    for post in posts
+                ],
+            )
+        return
+    PostTerm.objects.using(using).filter(post_id__in=ids).delete()
+    PostTerm.objects.using(using).bulk_create(
+        [
+            PostTerm(post_id=post.pk, term=term, weight=weight)
+            for post in posts
+            for term, weight in document_terms(post).items()
+        ],
+        batch_size=constants.SEARCH_INDEX_BATCH,
+    )
+
+
+def unindex_post(post_id, using=DEFAULT_DB_ALIAS):
+    """Убирает публикацию из FTS5; строки ``PostTerm`` удалит каскад."""
+    if fts_enabled(using):
+        with connections[using].cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [post_id]
+            )
+
+
+def clear_index(using=DEFAULT_DB_ALIAS):
+    from blog.models import PostTerm
+
+    if fts_enabled(using):
+        with connections[using].cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+    PostTerm.objects.using(using).all().delete()
+
+
+def search_posts(queryset, query):
+    """Публикации из ``queryset``, содержащие все слова запроса.
+
+    Результат отсортирован по релевантности, а при равенстве — по дате.
+    """
+    terms = list(dict.fromkeys(tokenize(query)))
+    if not terms:
+        return queryset.none()
+    if fts_enabled(queryset.db):
+        match = " ".join(f'"{term}"' for term in terms)
+        table = queryset.model._meta.db_table
+        # Таблица FTS5 присоединяется один раз: MATCH и bm25 вычисляются
+        # за один проход по индексу, а не в подзапросе для каждой строки.
+        return queryset.extra(
+            tables=[FTS_TABLE],
+            where=[
+                f"{FTS_TABLE} MATCH %s",
+                f"{FTS_TABLE}.rowid = {table}.id",
+            ],
+            params=[match],
+            select={
+                "rank": f"-bm25({FTS_TABLE}, "
+                f"{constants.SEARCH_TITLE_WEIGHT}, 1)"
+            },
+        ).order_by("-rank", "-pub_date")
+    return (
+        queryset.filter(search_terms__term__in=terms)
+        .annotate(
+            matched=Count("search_terms"),
+            rank=Sum("search_terms__weight"),
+        )
+        .filter(matched=len(terms))
+        .order_by("-rank", "-pub_date")
+    )
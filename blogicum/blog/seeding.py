@@ -0,0 +1,115 @@
+"""Генерация синтетических данных для нагрузочных тестов.
+
+Каждая порция строк генерируется своим ``random.Random``, засеянным
+(seed, модель, номер порции), и получает заранее известный диапазон pk,
+поэтому результат не зависит от числа процессов.
+"""
+import random
+from datetime import timedelta
+from itertools import accumulate
+
+from blogicum import constants
+
+WORDS = (
+    "утро день вечер ночь город дорога река море лес поле дом окно кот "
+    "собака друг сосед книга письмо поезд вокзал дождь снег солнце ветер "
+    "работа отпуск обед ужин кофе чай музыка театр кино прогулка парк сад "
+    "весна лето осень зима новость история встреча праздник подарок "
+    "старый новый тихий шумный долгий короткий тёплый холодный светлый "
+    "гулял читал писал ждал видел слушал думал вспоминал нашёл потерял"
+).split()
+
+
+def sentence(rng, low, high):
+    words = rng.choices(WORDS, k=rng.randint(low, high))
+    return " ".join(words).capitalize()
+
+
+def chunks(first_pk, total, size=constants.SEED_CHUNK_SIZE):
+    """Порции ``(номер, первый pk, количество)``."""
+    for number, start in enumerate(range(0, total, size)):
+        yield number, first_pk + start, min(size, total - start)
+
+
+def chunk_random(seed, label, number):
+    return random.Random(f"{seed}:{label}:{number}")
+
+
+def post_rows(task):
+    """Строки публикаций одной порции.
+
+    Даты смещены к настоящему времени; доля ``future_share`` публикаций
+    отложена на ближайшие дни.
+    """
+    seed, (number, first_pk, count), refs, anchor, future_share = task
+    users, categories, locations = refs
+    rng = chunk_random(seed, "post", number)
+    rows = []
+    for pk in range(first_pk, first_pk + count):
+        if rng.random() < future_share:
+            offset = rng.uniform(0, constants.SEED_SCHEDULE_DAYS)
+        else:
+            offset = -constants.SEED_HISTORY_DAYS * rng.random() ** 2
+        pub_date = anchor + timedelta(days=offset)
+        rows.append({
+            "pk": pk,
+            "title": sentence(rng, 2, 6)[: constants.MAX_FIELD_LENGTH],
+            "text": ". ".join(
+                sentence(rng, 6, 20) for _ in range(rng.randint(1, 8))
+            ),
+            "pub_date": pub_date,
+            "created_at": min(pub_date, anchor),
+            "is_published": rng.random() < 0.95,
+            "author_id": rng.randint(*users),
+            "category_id": rng.randint(*categories),
+            "location_id": (
+                rng.randint(*locations)
+                if locations[0] is not None and rng.random() < 0.7
+                else None
+            ),
+        })
+    return rows
+
+
+_popularity = None
+
+
+def init_comment_worker(seed, posts):
+    """Готовит в процессе распределение Ципфа по публикациям.
+
+    ``posts`` — пары (pk, pub_date) публикаций, вышедших к моменту
+    генерации. Самые популярные публикации выбираются перемешиванием,
+    одинаковым для всех процессов.
+    """
+    global _popularity
+    pub_dates = dict(posts)
+    ids = sorted(pub_dates)
+    random.Random(f"{seed}:popularity").shuffle(ids)
+    weights = accumulate(
+        1 / rank ** constants.SEED_ZIPF_EXPONENT
+        for rank in range(1, len(ids) + 1)
+    )
+    _popularity = ids, list(weights), pub_dates
+
+
+def comment_rows(task):
+    """Строки комментариев одной порции.
+
+    Комментарий появляется между публикацией поста и ``anchor``, чаще
+    ближе к ``anchor``.
+    """
+    seed, (number, first_pk, count), users, anchor = task
+    ids, weights, pub_dates = _popularity
+    rng = chunk_random(seed, "comment", number)
+    post_ids = rng.choices(ids, cum_weights=weights, k=count)
+    rows = []
+    for pk, post_id in zip(range(first_pk, first_pk + count), post_ids):
+        age = (anchor - pub_dates[post_id]) * rng.random() ** 3
+        rows.append({
+            "pk": pk,
+            "post_id": post_id,
+            "author_id": rng.randint(*users),
+            "text": sentence(rng, 3, 25),
+            "created_at": anchor - age,
+        })
+    return rows
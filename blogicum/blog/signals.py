@@ -0,0 +1,218 @@
+from collections import Counter
+from contextvars import ContextVar
+
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import (
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from blog.cache import bump_page_generation, forget_post_cards
+from blog.jobs import enqueue_image
+from blog.models import Category, Comment, Location, Post, User
+from blog.search import index_posts, unindex_post
+
+
+def change_comment_count(post_id, delta):
+    """Сдвигает счётчик комментариев поста одним UPDATE.
+
+    Разошедшийся счётчик не уходит ниже нуля.
+    """
+    Post.objects.filter(pk=post_id).update(
+        comment_count=Greatest(F("comment_count") + delta, 0)
+    )
+    forget_post_cards([post_id])
+
+
+class PendingDeletes:
+    """Комментарии и посты, которые удаляет текущая операция ``delete()``.
+
+    Django отправляет ``pre_delete`` для всех удаляемых объектов раньше
+    первого ``post_delete``, поэтому заранее известно, сколько комментариев
+    уйдёт у каждого поста и какие посты удаляются вместе с ними.
+    """
+
+    def __init__(self):
+        self.remaining = Counter()
+        self.removed = Counter()
+        self.posts = set()
+
+
+_pending_deletes = ContextVar("pending_deletes", default=None)
+
+
+def pending_deletes():
+    pending = _pending_deletes.get()
+    if pending is None:
+        pending = PendingDeletes()
+        _pending_deletes.set(pending)
+    return pending
+
+
+@receiver(pre_save, sender=Comment)
+def remember_comment_post(sender, instance, raw, **kwargs):
+    """Запоминает прежний пост комментария перед изменением."""
+    if raw or instance._state.adding:
+        return
+    instance._previous_post_id = (
+        Comment.objects.filter(pk=instance.pk)
+        .values_list("post_id", flat=True)
+        .first()
+    )
+
+
+@receiver(post_save, sender=Comment)
+def count_saved_comment(sender, instance, created, raw, **kwargs):
+    """Учитывает новый или перенесённый комментарий."""
+    if raw:
+        return
+    if created:
+        change_comment_count(instance.post_id, 1)
+        return
+    previous_post_id = getattr(instance, "_previous_post_id", None)
+    if previous_post_id and previous_post_id != instance.post_id:
+        change_comment_count(previous_post_id, -1)
+        change_comment_count(instance.post_id, 1)
+
+
+@receiver(pre_delete, sender=Post)
+def remember_deleted_post(sender, instance, **kwargs):
+    """Отмечает пост, счётчик которого при удалении не нужно сдвигать."""
+    pending_deletes().posts.add(instance.pk)
+
+
+@receiver(post_delete, sender=Post)
+def forget_deleted_post(sender, instance, **kwargs):
+    pending_deletes().posts.discard(instance.pk)
+
+
+@receiver(pre_delete, sender=Comment)
+def remember_deleted_comment(sender, instance, **kwargs):
+    pending_deletes().remaining[instance.post_id] += 1
+
+
+@receiver(post_delete, sender=Comment)
+def count_deleted_comment(sender, instance, **kwargs):
+    """Учитывает удалённые комментарии одним UPDATE на пост.
+
+    Комментарии удаляемого поста не учитываются: его строка уходит сама.
+    """
+    pending = pending_deletes()
+    post_id = instance.post_id
+    pending.remaining[post_id] -= 1
+    pending.removed[post_id] += 1
+    if pending.remaining[post_id] > 0:
+        return
+    del pending.remaining[post_id]
+    removed = pending.removed.pop(post_id)
+    if post_id in pending.posts:
+        return
+    change_comment_count(post_id, -removed)
+    bump_page_generation()
+
+
+def release_image_on_commit(name):
+    """Удаляет неиспользуемый файл картинки после фиксации транзакции."""
+    if name:
+        transaction.on_commit(lambda: Post.objects.release_image(name))
+
+
+@receiver(pre_save, sender=Post)
+def remember_image_upload(sender, instance, raw, **kwargs):
+    """Запоминает новую загрузку и прежнюю картинку публикации."""
+    if raw:
+        return
+    instance._image_uploaded = (
+        bool(instance.image) and not instance.image._committed
+    )
+    if not instance._state.adding:
+        instance._previous_image = (
+            Post.objects.filter(pk=instance.pk)
+            .values_list("image", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=Post)
+def enqueue_post_image(sender, instance, **kwargs):
+    """Отправляет новую картинку на обработку в фоновую очередь."""
+    if getattr(instance, "_image_uploaded", False):
+        instance._image_uploaded = False
+        enqueue_image(instance)
+    previous_image = getattr(instance, "_previous_image", None)
+    if previous_image and previous_image != instance.image.name:
+        release_image_on_commit(previous_image)
+    instance._previous_image = None
+
+
+@receiver(post_delete, sender=Post)
+def release_post_image(sender, instance, **kwargs):
+    """Удаляет картинку удалённой публикации, если она больше не нужна."""
+    release_image_on_commit(instance.image.name)
+
+
+@receiver(post_save, sender=Post)
+def index_saved_post(sender, instance, using, update_fields, **kwargs):
+    """Переиндексирует публикацию при изменении заголовка или текста."""
+    if update_fields and not {"title", "text"} & set(update_fields):
+        return
+    index_posts([instance], using=using)
+
+
+@receiver(post_delete, sender=Post)
+def unindex_deleted_post(sender, instance, using, **kwargs):
+    """Удаляет удалённую публикацию из поискового индекса."""
+    unindex_post(instance.pk, using=using)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def forget_post_card(sender, instance, **kwargs):
+    """Сбрасывает карточку изменённой публикации."""
+    forget_post_cards([instance.pk])
+
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(pre_delete, sender=Location)
+def forget_related_post_cards(sender, instance, **kwargs):
+    """Сбрасывает карточки публикаций категории или местоположения."""
+    forget_post_cards(
+        instance.posts.values_list("pk", flat=True).iterator()
+    )
+
+
+@receiver(post_save, sender=User)
+def forget_author_post_cards(sender, instance, update_fields, **kwargs):
+    """Сбрасывает карточки публикаций автора при смене его имени."""
+    if update_fields and "username" not in update_fields:
+        return
+    forget_post_cards(
+        instance.posts.values_list("pk", flat=True).iterator()
+    )
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Comment)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def expire_cached_pages(sender, **kwargs):
+    """Сбрасывает кэш страниц для анонимных посетителей."""
+    bump_page_generation()
+
+
+@receiver(post_save, sender=User)
+def expire_cached_author_pages(sender, update_fields, **kwargs):
+    """Сбрасывает кэш страниц при смене имени пользователя."""
+    if update_fields and "username" not in update_fields:
+        return
+    bump_page_generation()
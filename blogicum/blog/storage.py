@@ -0,0 +1,58 @@
+import re
+from hashlib import sha256
+from posixpath import basename, dirname, join, splitext
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+
+HASHED_NAME = re.compile(r"^[0-9a-f]{64}\.\w+$")
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """Хранит каждый уникальный файл один раз под именем из его SHA-256.
+
+    Повторная загрузка того же содержимого получает уже существующее имя.
+    Производные файлы, например уменьшенные копии, сохраняются методом
+    ``save_derived`` под переданным именем, чтобы лежать рядом с
+    оригиналом при любом его имени.
+    """
+
+    @staticmethod
+    def content_hash(content):
+        digest = getattr(content, "content_hash", None)
+        if digest:
+            return digest
+        hasher = sha256()
+        for chunk in content.chunks():
+            hasher.update(chunk)
+        return hasher.hexdigest()
+
+    def hashed_name(self, name, content):
+        directory, filename = dirname(name), basename(name)
+        if HASHED_NAME.match(filename):
+            directory = dirname(directory)
+        digest = self.content_hash(content)
+        extension = splitext(filename)[1].lower()
+        return join(directory, digest[:2], f"{digest}{extension}")
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+        name = self.hashed_name(name, content)
+        if self.exists(name):
+            return name
+        return self.save_derived(name, content, max_length=max_length)
+
+    def save_derived(self, name, content, max_length=None):
+        """Сохраняет файл под переданным именем, не вычисляя хэш."""
+        saved = super().save(name, content, max_length=max_length)
+        if saved != name and self.exists(name):
+            # Тот же файл успел записать параллельный процесс.
+            self.delete(saved)
+            return name
+        return saved
+
+
+post_image_storage = ContentAddressedStorage()
@@ -0,0 +1,52 @@
+from hashlib import sha256
+from io import BytesIO
+
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+
+from blog.images import IncompleteHeader, image_header_error, upload_size_error
+from blogicum import constants
+
+
+class PostImageUploadHandler(TemporaryFileUploadHandler):
+    """Пишет загрузку во временный файл и отсекает слишком большие картинки.
+
+    Размеры картинки проверяются по заголовку из первых байт загрузки. После
+    отказа данные больше не сохраняются, а причина передаётся форме в
+    атрибуте ``upload_error`` файла. Хэш содержимого считается по ходу
+    загрузки и сохраняется в атрибуте ``content_hash``.
+    """
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.received = 0
+        self.hasher = sha256()
+        self.header = b""
+        self.upload_error = ""
+
+    def check_header(self, raw_data):
+        if self.header is None:
+            return
+        self.header += raw_data[: constants.IMAGE_HEADER_LIMIT]
+        try:
+            self.upload_error = image_header_error(BytesIO(self.header))
+        except IncompleteHeader:
+            if len(self.header) < constants.IMAGE_HEADER_LIMIT:
+                return
+        self.header = None
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if not self.upload_error:
+            self.upload_error = upload_size_error(self.received)
+        if not self.upload_error:
+            self.check_header(raw_data)
+        if self.upload_error:
+            return None
+        self.hasher.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        file = super().file_complete(file_size)
+        file.upload_error = self.upload_error
+        file.content_hash = self.hasher.hexdigest()
+        return file
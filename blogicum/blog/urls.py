@@ -1,6 +1,9 @@
-from django.urls import path
+from django.urls import path, register_converter
 
-from blog import views
+from blog import api, views
+from blog.converters import FeedTypeConverter
+
+register_converter(FeedTypeConverter, "feed")
 
 app_name = "blog"
 
@@ -11,6 +14,32 @@ urlpatterns = [
         views.post_detail,
         name="post_detail",
     ),
+    path(
+        "posts/<int:post_id>/comments/",
+        views.post_comments,
+        name="post_comments",
+    ),
+    path("search/", views.search, name="search"),
+    path("api/posts/", api.post_list, name="api_posts"),
+    path("api/posts/<int:post_id>/", api.post_item, name="api_post"),
+    path(
+        "api/posts/<int:post_id>/comments/",
+        api.comment_list,
+        name="api_comments",
+    ),
+    path("api/categories/", api.category_list, name="api_categories"),
+    path("api/locations/", api.location_list, name="api_locations"),
+    path("feeds/<feed:feed_type>/", views.posts_feed, name="posts_feed"),
+    path(
+        "feeds/<feed:feed_type>/category/<slug:category_slug>/",
+        views.category_feed,
+        name="category_feed",
+    ),
+    path(
+        "feeds/<feed:feed_type>/profile/<str:username>/",
+        views.author_feed,
+        name="author_feed",
+    ),
     path(
         "category/<slug:category_slug>/",
         views.category_posts,
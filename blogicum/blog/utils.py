@@ -1,25 +1,277 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from collections.abc import Sequence
+from contextlib import contextmanager
 from functools import wraps
+from hashlib import md5
+from time import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
 from django.core.paginator import Paginator
+from django.db.models import Q
 from django.shortcuts import get_object_or_404, redirect
+from django.views.decorators.http import condition
 
+from blog.cache import page_cache_key, page_cache_timeout, page_generation
 from blog.models import Post
 from blogicum import constants
+from blogicum.routers import (
+    READ_ONLY_ALIAS,
+    read_alias,
+    reading_from,
+    reading_replica,
+)
+
+
+class CursorPage(Sequence):
+    """Страница курсорной пагинации."""
+
+    is_cursor = True
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """Пагинация по ключу (поле сортировки, id) без COUNT и OFFSET.
 
+    Работает и с ``values()``, если в выборку входят ключ и id.
+    """
 
-def paginate_by(request, posts):
-    """Пагинация постов."""
+    def __init__(self, object_list, per_page, key="pub_date", descending=True):
+        self.object_list = object_list
+        self.per_page = per_page
+        self.key = key
+        self.descending = descending
+
+    @staticmethod
+    def _get(obj, name):
+        """Значение поля у объекта модели или у словаря из ``values()``."""
+        if isinstance(obj, dict):
+            return obj[name]
+        return getattr(obj, name)
+
+    def encode_cursor(self, obj):
+        value = self._get(obj, self.key)
+        value = value.isoformat() if hasattr(value, "isoformat") else value
+        pk = self._get(obj, self.object_list.model._meta.pk.attname)
+        raw = f"{value}|{pk}".encode()
+        return urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def decode_cursor(self, cursor):
+        """Возвращает пару (значение ключа, id) или None."""
+        try:
+            raw = urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            value, pk = raw.decode().rsplit("|", 1)
+            field = self.object_list.model._meta.get_field(self.key)
+            return field.to_python(value), int(pk)
+        except (BinasciiError, UnicodeDecodeError, ValueError,
+                ValidationError):
+            return None
+
+    def _seek(self, position, forward):
+        value, pk = position
+        if forward == self.descending:
+            return Q(**{f"{self.key}__lt": value}) | Q(
+                **{self.key: value, "pk__lt": pk}
+            )
+        return Q(**{f"{self.key}__gt": value}) | Q(
+            **{self.key: value, "pk__gt": pk}
+        )
+
+    def _ordering(self, forward):
+        prefix = "-" if forward == self.descending else ""
+        return f"{prefix}{self.key}", f"{prefix}pk"
+
+    def get_page(self, after=None, before=None):
+        after = after and self.decode_cursor(after)
+        before = before and self.decode_cursor(before)
+        forward = not before
+        position = after if forward else before
+        queryset = self.object_list.order_by(*self._ordering(forward))
+        if position:
+            queryset = queryset.filter(self._seek(position, forward))
+        rows = list(queryset[: self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+        if not forward:
+            rows.reverse()
+        if not rows:
+            return CursorPage(rows)
+        has_next = has_more if forward else True
+        has_previous = bool(position) if forward else has_more
+        return CursorPage(
+            rows,
+            next_cursor=self.encode_cursor(rows[-1]) if has_next else None,
+            previous_cursor=(
+                self.encode_cursor(rows[0]) if has_previous else None
+            ),
+        )
+
+
+def paginate_by(request, posts, cursor=True):
+    """Пагинация постов.
+
+    Курсоры ``after``/``before`` включают курсорный режим; при
+    ``BLOG_CURSOR_PAGINATION`` он же используется для первой страницы.
+    Ссылки вида ``?page=N`` продолжают работать постранично. Выборки,
+    отсортированные не по дате, передаются с ``cursor=False``.
+    """
+    after = request.GET.get("after")
+    before = request.GET.get("before")
+    page_number = request.GET.get("page")
+    if cursor and (after or before or (
+        settings.BLOG_CURSOR_PAGINATION and page_number is None
+    )):
+        paginator = CursorPaginator(posts, constants.POSTS_BY_PAGE)
+        return paginator.get_page(after=after, before=before)
     paginator = Paginator(posts, constants.POSTS_BY_PAGE)
-    return paginator.get_page(request.GET.get("page"))
+    return paginator.get_page(page_number)
+
+
+def paginate_comments(post, after=None):
+    """Порция комментариев поста от старых к новым."""
+    paginator = CursorPaginator(
+        post.comments.select_related("author"),
+        constants.COMMENTS_BY_PAGE,
+        key="created_at",
+        descending=False,
+    )
+    return paginator.get_page(after=after)
 
 
 def is_post_author(func):
-    """Проверяет, является ли пользователь автором поста."""
+    """Проверяет, является ли пользователь автором поста.
+
+    Пост загружается один раз и передаётся view в ``request.blog_post``.
+    """
 
     @wraps(func)
     def wrapper(request, post_id, *args, **kwargs):
         post = get_object_or_404(Post, id=post_id)
-        if request.user != post.author:
+        if post.author_id != request.user.id:
             return redirect("blog:post_detail", post_id=post.id)
+        request.blog_post = post
         return func(request, post_id, *args, **kwargs)
 
     return wrapper
+
+
+def read_only_view(func):
+    """Выполняет чтение GET-запроса через соединение только для чтения.
+
+    Без настроенной базы ``readonly`` запросы идут в default. Реплика,
+    уже выбранная ``ReplicaMiddleware``, не переопределяется.
+    """
+
+    @wraps(func)
+    def wrapper(request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD") or read_alias.get():
+            return func(request, *args, **kwargs)
+        with reading_from(READ_ONLY_ALIAS):
+            return func(request, *args, **kwargs)
+
+    return wrapper
+
+
+def cache_for_anonymous(func):
+    """Кэширует страницу для неавторизованных посетителей.
+
+    Страница живёт не дольше, чем до ближайшей отложенной публикации, и
+    сбрасывается при изменении публикаций, категорий, местоположений и
+    комментариев. Страница, прочитанная из реплики, может не содержать
+    последних изменений, поэтому хранится не дольше ``REPLICA_MAX_LAG``.
+    """
+
+    @wraps(func)
+    def wrapper(request, *args, **kwargs):
+        if (
+            request.method not in ("GET", "HEAD")
+            or request.user.is_authenticated
+        ):
+            return func(request, *args, **kwargs)
+        key = page_cache_key(request)
+        response = cache.get(key)
+        if response is not None:
+            return response
+        response = func(request, *args, **kwargs)
+        if response.status_code == 200:
+            timeout = page_cache_timeout()
+            if reading_replica():
+                timeout = min(timeout, constants.REPLICA_MAX_LAG)
+            if timeout > 0:
+                cache.set(key, response, timeout)
+        return response
+
+    return wrapper
+
+
+def conditional_page(get_queryset):
+    """Отвечает 304 Not Modified, если видимые записи не менялись.
+
+    ETag строится из поколения кэша страниц, которое меняется при любой
+    правке, удалении и комментарии, и из самой свежей записи
+    ``get_queryset(request, *args, **kwargs)``: так учитываются отложенные
+    публикации, ставшие видимыми. Свежая запись берётся по индексу ленты.
+    Last-Modified не отдаётся: времени правки у записей нет.
+    """
+
+    def etag(request, *args, **kwargs):
+        latest = (
+            get_queryset(request, *args, **kwargs)
+            .order_by("-pub_date", "-id")
+            .values_list("pub_date", "id")
+            .first()
+        )
+        # Валидатор страницы из реплики устаревает вместе с допустимым
+        # отставанием реплики.
+        replica_period = (
+            int(time() // constants.REPLICA_MAX_LAG)
+            if reading_replica()
+            else None
+        )
+        raw = ":".join(
+            str(value)
+            for value in (
+                page_generation(),
+                request.user.pk,
+                request.get_full_path(),
+                latest,
+                replica_period,
+            )
+        )
+        return md5(raw.encode()).hexdigest()
+
+    return condition(etag_func=etag)
+
+
+@contextmanager
+def explicit_created_at(*models):
+    """Позволяет записать свои ``created_at`` вместо ``auto_now_add``."""
+    fields = [model._meta.get_field("created_at") for model in models]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
@@ -1,37 +1,52 @@
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Count
+from django.db import transaction
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 from django.utils import timezone
 from django.views.decorators.http import require_http_methods
 from django.views.generic import UpdateView
 
+from blog.feeds import feed_response
 from blog.forms import CommentForm, PostForm
 from blog.models import Category, Comment, Post, User
-from blog.utils import is_post_author, paginate_by
+from blog.search import search_posts
+from blog.utils import (
+    cache_for_anonymous,
+    conditional_page,
+    is_post_author,
+    paginate_by,
+    paginate_comments,
+    read_only_view,
+)
 
 
+@read_only_view
+@conditional_page(lambda request: Post.objects.published_posts())
+@cache_for_anonymous
 def index(request):
     """Главная страница."""
+    posts = (
+        Post.objects.published_posts()
+        .select_related("author", "category", "location")
+        .order_by("-pub_date")
+    )
     return render(
         request,
         "blog/index.html",
         context={
-            "posts": Post.objects.published_posts()
-                .order_by(
-                    "-pub_date",
-                )
-                .annotate(comment_count=Count("comments")),
-            "page_obj": paginate_by(request, Post.objects.published_posts()
-                .order_by(
-                    "-pub_date",
-                )
-                .annotate(comment_count=Count("comments"))),
+            "page_obj": paginate_by(request, posts),
         },
     )
 
 
+@read_only_view
+@conditional_page(
+    lambda request, username: Post.objects.get_user_posts(
+        User.objects.filter(is_active=True, username=username)[:1]
+    )
+)
+@cache_for_anonymous
 def profile(request, username):
     """Страница пользователя."""
     user = get_object_or_404(
@@ -41,8 +56,8 @@ def profile(request, username):
     )
     posts = (
         Post.objects.get_user_posts(user)
+        .select_related("author", "category", "location")
         .order_by("-pub_date")
-        .annotate(comment_count=Count("comments"))
     )
 
     return render(
@@ -95,7 +110,7 @@ def create_post(request):
 @is_post_author
 def edit_post(request, post_id):
     """Редактирование поста."""
-    post = get_object_or_404(Post, id=post_id)
+    post = request.blog_post
 
     form = PostForm(
         request.POST or None,
@@ -120,44 +135,64 @@ def edit_post(request, post_id):
 @is_post_author
 def delete_post(request, post_id):
     """Удаление поста."""
-    post = get_object_or_404(Post, id=post_id)
-    post.delete()
+    request.blog_post.delete()
     return redirect("blog:index")
 
 
+@read_only_view
+@conditional_page(
+    lambda request, post_id: Post.objects.visible_posts(request.user).filter(
+        id=post_id
+    )
+)
+@cache_for_anonymous
 def post_detail(request, post_id):
     """Отдельная страница публикации."""
     post = get_object_or_404(
-        Post.objects.select_related(
+        Post.objects.visible_posts(request.user).select_related(
             "category",
             "author",
             "location",
         ),
         id=post_id,
     )
-    if post.author == request.user:
-        comments = post.comments.all()
-    else:
-        post = get_object_or_404(
-            Post.objects.filter(
-                pub_date__lte=timezone.now(),
-                category__is_published=True,
-                is_published=True,
-                id=post_id,
-            )
-        )
-        comments = post.comments.all()
     return render(
         request,
         "blog/detail.html",
         context={
             "post": post,
-            "comments": comments,
+            "comments": paginate_comments(
+                post, request.GET.get("comments_after")
+            ),
             "form": CommentForm(),
         },
     )
 
 
+@read_only_view
+def post_comments(request, post_id):
+    """Фрагмент со следующей порцией комментариев публикации."""
+    post = get_object_or_404(
+        Post.objects.visible_posts(request.user).only("id"),
+        id=post_id,
+    )
+    return render(
+        request,
+        "includes/comment_list.html",
+        context={
+            "post": post,
+            "comments": paginate_comments(post, request.GET.get("after")),
+        },
+    )
+
+
+@read_only_view
+@conditional_page(
+    lambda request, category_slug: Post.objects.published_posts().filter(
+        category__slug=category_slug
+    )
+)
+@cache_for_anonymous
 def category_posts(request, category_slug):
     """Страница категории."""
     category = get_object_or_404(
@@ -189,6 +224,80 @@ def category_posts(request, category_slug):
     )
 
 
+@read_only_view
+def search(request):
+    """Поиск по опубликованным публикациям."""
+    query = request.GET.get("q", "").strip()
+    posts = search_posts(
+        Post.objects.published_posts().select_related(
+            "author", "category", "location"
+        ),
+        query,
+    )
+    return render(
+        request,
+        "blog/search.html",
+        context={
+            "page_obj": paginate_by(request, posts, cursor=False),
+            "query": query,
+        },
+    )
+
+
+@read_only_view
+@conditional_page(lambda request, **kwargs: Post.objects.published_posts())
+def posts_feed(request, feed_type):
+    """Лента всех опубликованных публикаций."""
+    return feed_response(
+        request,
+        feed_type,
+        Post.objects.published_posts(),
+        title="Блогикум",
+        link=reverse("blog:index"),
+        description="Новые публикации Блогикума.",
+    )
+
+
+@read_only_view
+@conditional_page(
+    lambda request, category_slug, **kwargs: (
+        Post.objects.published_posts().filter(category__slug=category_slug)
+    )
+)
+def category_feed(request, feed_type, category_slug):
+    """Лента публикаций категории."""
+    category = get_object_or_404(
+        Category.objects.filter(is_published=True, slug=category_slug)
+    )
+    return feed_response(
+        request,
+        feed_type,
+        Post.objects.published_posts().filter(category=category),
+        title=f"Блогикум — {category.title}",
+        link=reverse("blog:category_posts", args=(category.slug,)),
+        description=category.description,
+    )
+
+
+@read_only_view
+@conditional_page(
+    lambda request, username, **kwargs: (
+        Post.objects.published_posts().filter(author__username=username)
+    )
+)
+def author_feed(request, feed_type, username):
+    """Лента публикаций автора."""
+    author = get_object_or_404(User, is_active=True, username=username)
+    return feed_response(
+        request,
+        feed_type,
+        Post.objects.published_posts().filter(author=author),
+        title=f"Блогикум — {author.get_full_name() or author.username}",
+        link=reverse("blog:profile", args=(author.username,)),
+        description=f"Публикации пользователя {author.username}.",
+    )
+
+
 @login_required
 def add_comment(request, post_id):
     """Страница добавления комментария."""
@@ -198,7 +307,8 @@ def add_comment(request, post_id):
         comment = form.save(commit=False)
         comment.author = request.user
         comment.post = post
-        comment.save()
+        with transaction.atomic():
+            comment.save()
     return redirect("blog:post_detail", post_id=post_id)
 
 
@@ -231,6 +341,7 @@ def delete_comment(request, post_id, comment_id):
     if request.user != comment.author:
         return redirect("blog:post_detail", post_id)
     if request.method == "POST":
-        comment.delete()
+        with transaction.atomic():
+            comment.delete()
         return redirect("blog:post_detail", post_id)
     return render(request, "blog/comment.html")
@@ -3,3 +3,46 @@ POSTS_BY_PAGE = 10
 MAX_NAME_LENGTH = 15
 MAX_TITLE_LENGTH = 15
 MAX_DESCRIPTION_LENGTH = 15
+COMMENTS_BY_PAGE = 20
+PAGE_CACHE_TIMEOUT = 300
+IMAGE_RENDITIONS = {
+    "card": 640,
+    "detail": 960,
+    "retina": 1920,
+}
+IMAGE_RENDITION_QUALITY = 82
+IMAGE_JOB_MAX_ATTEMPTS = 3
+IMAGE_JOB_TIMEOUT = 600
+IMAGE_JOB_STATUS_LENGTH = 16
+MAX_IMAGE_SIZE = 10 * 1024 * 1024
+MAX_IMAGE_PIXELS = 40_000_000
+IMAGE_HEADER_LIMIT = 64 * 1024
+STATIC_IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+STATIC_MAX_AGE = 60
+STATIC_COMPRESS_MIN_SIZE = 256
+REPLICA_APPS = ("blog", "pages")
+REPLICA_PIN_COOKIE = "read_primary"
+REPLICA_PIN_SECONDS = 10
+REPLICA_MAX_LAG = 5
+REPLICA_LAG_CHECK_INTERVAL = 5
+REPLICA_LAG_MODELS = ("blog.Post", "blog.Comment")
+SEARCH_TERM_LENGTH = 64
+SEARCH_TITLE_WEIGHT = 3
+SEARCH_INDEX_BATCH = 500
+FEED_ITEMS = 50
+FEED_CHUNK_SIZE = 100
+API_PAGE_SIZE = 20
+API_MAX_PAGE_SIZE = 100
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_USER_FIELDS = (
+    "username",
+    "first_name",
+    "last_name",
+    "is_active",
+    "date_joined",
+)
+IMPORT_BATCH_SIZE = 900
+SEED_CHUNK_SIZE = 5000
+SEED_ZIPF_EXPONENT = 1.1
+SEED_HISTORY_DAYS = 730
+SEED_SCHEDULE_DAYS = 30
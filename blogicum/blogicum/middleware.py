@@ -0,0 +1,127 @@
+import mimetypes
+import re
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse
+from django.utils._os import safe_join
+
+from blogicum import constants
+from blogicum.routers import (
+    REPLICA_ALIAS,
+    read_alias,
+    replica_configured,
+    replica_is_fresh,
+)
+
+HASHED_NAME = re.compile(r"\.[0-9a-f]{12}\.\w+$")
+SAFE_METHODS = ("GET", "HEAD")
+ENCODINGS = (
+    ("br", ".br"),
+    ("gzip", ".gz"),
+)
+
+
+class StaticFilesMiddleware:
+    """Раздаёт собранную статику без отдельного веб-сервера.
+
+    Отдаёт заранее сжатую копию файла, если клиент её принимает, а файлам
+    с хэшем в имени ставит долгое неизменяемое кэширование.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if settings.SERVE_STATIC and request.path.startswith(
+            settings.STATIC_URL
+        ) and request.method in SAFE_METHODS:
+            response = self.serve(request)
+            if response is not None:
+                return response
+        return self.get_response(request)
+
+    def find(self, name):
+        try:
+            path = Path(safe_join(settings.STATIC_ROOT, name))
+        except SuspiciousFileOperation:
+            return None
+        return path if path.is_file() else None
+
+    def serve(self, request):
+        name = request.path[len(settings.STATIC_URL):]
+        path = self.find(name)
+        if path is None:
+            return None
+        accepted = request.headers.get("Accept-Encoding", "")
+        encoding = None
+        for candidate, extension in ENCODINGS:
+            compressed = self.find(f"{name}{extension}")
+            if candidate in accepted and compressed is not None:
+                path, encoding = compressed, candidate
+                break
+        content_type, _ = mimetypes.guess_type(name)
+        response = FileResponse(
+            path.open("rb"),
+            content_type=content_type or "application/octet-stream",
+        )
+        if encoding:
+            response["Content-Encoding"] = encoding
+        response["Vary"] = "Accept-Encoding"
+        if HASHED_NAME.search(name):
+            response["Cache-Control"] = (
+                f"public, max-age={constants.STATIC_IMMUTABLE_MAX_AGE}, "
+                "immutable"
+            )
+        else:
+            response["Cache-Control"] = (
+                f"public, max-age={constants.STATIC_MAX_AGE}"
+            )
+        return response
+
+
+class ReplicaMiddleware:
+    """Отправляет чтение страниц блога в реплику.
+
+    Реплика используется для GET-запросов к приложениям из
+    ``REPLICA_APPS``, если она не отстаёт от основной базы. После
+    успешного изменяющего запроса cookie на ``REPLICA_PIN_SECONDS``
+    закрепляет чтение пользователя за основной базой, чтобы он сразу увидел
+    свою запись.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.replica_token = None
+        try:
+            response = self.get_response(request)
+        finally:
+            if request.replica_token is not None:
+                read_alias.reset(request.replica_token)
+        if (
+            replica_configured()
+            and request.method not in SAFE_METHODS
+            and response.status_code < 400
+        ):
+            response.set_cookie(
+                constants.REPLICA_PIN_COOKIE,
+                "1",
+                max_age=constants.REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (
+            replica_configured()
+            and request.method in SAFE_METHODS
+            and request.resolver_match.app_name in constants.REPLICA_APPS
+            and constants.REPLICA_PIN_COOKIE not in request.COOKIES
+            and replica_is_fresh()
+        ):
+            request.replica_token = read_alias.set(REPLICA_ALIAS)
+        return None
@@ -0,0 +1,99 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError
+from django.db.models import Max
+
+from blogicum import constants
+
+READ_ONLY_ALIAS = "readonly"
+REPLICA_ALIAS = "replica"
+REPLICA_FRESH_KEY = "blogicum:replica_fresh"
+
+read_alias = ContextVar("read_alias", default=None)
+
+
+@contextmanager
+def reading_from(alias):
+    """Направляет чтение внутри блока в базу ``alias``, если она задана."""
+    token = read_alias.set(alias)
+    try:
+        yield
+    finally:
+        read_alias.reset(token)
+
+
+def reading_replica():
+    """Идёт ли чтение текущего запроса из реплики."""
+    return read_alias.get() == REPLICA_ALIAS
+
+
+def replica_configured():
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+def replica_lag():
+    """Насколько реплика отстаёт от основной базы.
+
+    Сравниваются последние ``created_at`` моделей из
+    ``REPLICA_LAG_MODELS``; ``None`` — реплика недоступна или пуста.
+    """
+    lag = timedelta()
+    for label in constants.REPLICA_LAG_MODELS:
+        manager = apps.get_model(label)._default_manager
+        latest = {}
+        for alias in (DEFAULT_DB_ALIAS, REPLICA_ALIAS):
+            try:
+                latest[alias] = manager.using(alias).aggregate(
+                    latest=Max("created_at")
+                )["latest"]
+            except DatabaseError:
+                return None
+        primary, replica = latest[DEFAULT_DB_ALIAS], latest[REPLICA_ALIAS]
+        if primary is None:
+            continue
+        if replica is None:
+            return None
+        lag = max(lag, primary - replica)
+    return lag
+
+
+def replica_is_fresh():
+    """Можно ли читать из реплики; результат кэшируется на несколько секунд."""
+    fresh = cache.get(REPLICA_FRESH_KEY)
+    if fresh is None:
+        lag = replica_lag()
+        fresh = lag is not None and lag <= timedelta(
+            seconds=constants.REPLICA_MAX_LAG
+        )
+        cache.set(
+            REPLICA_FRESH_KEY, fresh, constants.REPLICA_LAG_CHECK_INTERVAL
+        )
+    return fresh
+
+
+class ReadOnlyRouter:
+    """Читает из выбранного соединения только для чтения, пишет в default."""
+
+    def db_for_read(self, model, **hints):
+        alias = read_alias.get()
+        if alias in settings.DATABASES:
+            return alias
+        return None
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if obj1._state.db in settings.DATABASES and (
+            obj2._state.db in settings.DATABASES
+        ):
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, **hints):
+        return db == DEFAULT_DB_ALIAS
@@ -1,12 +1,39 @@
+import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
+
+def env_bool(name, default):
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def env_list(name, default):
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
 BASE_DIR = Path(__file__).resolve().parent.parent
-SECRET_KEY = "django-insecure-xn5)z4fdefk$^j!_&-!xukk-d@@eprv!nes2l_wp5f2=6_!l(a"
-DEBUG = True
-ALLOWED_HOSTS = [
+DEBUG = env_bool("DJANGO_DEBUG", True)
+SECRET_KEY = os.environ.get("DJANGO_SECRET_KEY")
+if not SECRET_KEY:
+    if not DEBUG:
+        raise ImproperlyConfigured(
+            "Задайте DJANGO_SECRET_KEY: без отладки ключ из репозитория "
+            "не используется."
+        )
+    SECRET_KEY = (
+        "django-insecure-xn5)z4fdefk$^j!_&-!xukk-d@@eprv!nes2l_wp5f2=6_!l(a"
+    )
+ALLOWED_HOSTS = env_list("DJANGO_ALLOWED_HOSTS", [
     "localhost",
     "127.0.0.1",
-]
+])
 
 INSTALLED_APPS = [
     "django.contrib.admin",
@@ -23,10 +50,12 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "blogicum.middleware.StaticFilesMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "blogicum.middleware.ReplicaMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -39,7 +68,7 @@ TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
         "DIRS": [TEMPLATES_DIR],
-        "APP_DIRS": True,
+        "APP_DIRS": DEBUG,
         "OPTIONS": {
             "context_processors": [
                 "django.template.context_processors.debug",
@@ -50,13 +79,58 @@ TEMPLATES = [
         },
     },
 ]
+if not DEBUG:
+    TEMPLATES[0]["OPTIONS"]["loaders"] = [
+        (
+            "django.template.loaders.cached.Loader",
+            [
+                "django.template.loaders.filesystem.Loader",
+                "django.template.loaders.app_directories.Loader",
+            ],
+        ),
+    ]
 
 WSGI_APPLICATION = "blogicum.wsgi.application"
 
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "ENGINE": os.environ.get(
+            "DJANGO_DB_ENGINE", "blogicum.sqlite"
+        ),
+        "NAME": os.environ.get("DJANGO_DB_NAME", BASE_DIR / "db.sqlite3"),
+        "USER": os.environ.get("DJANGO_DB_USER", ""),
+        "PASSWORD": os.environ.get("DJANGO_DB_PASSWORD", ""),
+        "HOST": os.environ.get("DJANGO_DB_HOST", ""),
+        "PORT": os.environ.get("DJANGO_DB_PORT", ""),
+        "CONN_MAX_AGE": int(
+            os.environ.get("DJANGO_CONN_MAX_AGE", 0 if DEBUG else 60)
+        ),
+    }
+}
+if env_bool("DJANGO_DB_READ_ONLY", False):
+    DATABASES["readonly"] = {
+        **DATABASES["default"],
+        "OPTIONS": {"read_only": True},
+        "TEST": {"MIRROR": "default"},
+    }
+if os.environ.get("DJANGO_DB_REPLICA_NAME"):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "NAME": os.environ["DJANGO_DB_REPLICA_NAME"],
+        "HOST": os.environ.get(
+            "DJANGO_DB_REPLICA_HOST", DATABASES["default"]["HOST"]
+        ),
+        "TEST": {"MIRROR": "default"},
+    }
+DATABASE_ROUTERS = ["blogicum.routers.ReadOnlyRouter"]
+
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get(
+            "DJANGO_CACHE_BACKEND",
+            "django.core.cache.backends.locmem.LocMemCache",
+        ),
+        "LOCATION": os.environ.get("DJANGO_CACHE_LOCATION", ""),
     }
 }
 
@@ -85,15 +159,24 @@ MEDIA_ROOT = BASE_DIR / "media/"
 MEDIA_URL = "/media/"
 
 STATIC_URL = "/static/"
-if DEBUG:
-    STATICFILES_DIRS = [
-        BASE_DIR / "static",
-    ]
-else:
-    STATIC_ROOT = BASE_DIR / "static"
+STATICFILES_DIRS = [
+    BASE_DIR / "static",
+]
+STATIC_ROOT = BASE_DIR / "staticfiles"
+if not DEBUG:
+    STATICFILES_STORAGE = (
+        "blogicum.staticstorage.CompressedManifestStaticFilesStorage"
+    )
+SERVE_STATIC = env_bool("DJANGO_SERVE_STATIC", not DEBUG)
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 EMAIL_BACKEND = "django.core.mail.backends.filebased.EmailBackend"
 EMAIL_FILE_PATH = BASE_DIR / "sent_emails"
 LOGIN_URL = "login"
 LOGIN_REDIRECT_URL = "blog:index"
+
+BLOG_CURSOR_PAGINATION = False
+
+FILE_UPLOAD_HANDLERS = [
+    "blog.uploadhandlers.PostImageUploadHandler",
+]
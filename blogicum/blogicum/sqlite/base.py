@@ -0,0 +1,35 @@
+from django.db.backends.sqlite3 import base
+
+CUSTOM_OPTIONS = ("pragmas", "read_only")
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """SQLite с настройками для одновременной работы читателей и писателя.
+
+    ``OPTIONS["pragmas"]`` дополняет PRAGMA по умолчанию, а
+    ``OPTIONS["read_only"]`` запрещает соединению запись.
+    """
+
+    pragmas = {
+        "journal_mode": "wal",
+        "synchronous": "normal",
+        "busy_timeout": 5000,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "memory",
+    }
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        for option in CUSTOM_OPTIONS:
+            params.pop(option, None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        options = self.settings_dict["OPTIONS"]
+        pragmas = {**self.pragmas, **options.get("pragmas", {})}
+        for pragma, value in pragmas.items():
+            conn.execute(f"PRAGMA {pragma} = {value}")
+        if options.get("read_only"):
+            conn.execute("PRAGMA query_only = ON")
+        return conn
@@ -0,0 +1,52 @@
+import gzip
+from pathlib import PurePosixPath
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+from blogicum import constants
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = {
+    ".css", ".js", ".map", ".svg", ".txt", ".html", ".json", ".xml", ".ico",
+}
+
+
+def compressors():
+    """Доступные алгоритмы сжатия и расширения их файлов."""
+    yield ".gz", lambda data: gzip.compress(data, compresslevel=9, mtime=0)
+    if brotli is not None:
+        yield ".br", brotli.compress
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Статика с хэшами в именах и заранее сжатыми копиями.
+
+    Рядом с каждым текстовым файлом из манифеста кладутся ``.gz`` и, если
+    установлен пакет ``brotli``, ``.br``.
+    """
+
+    def post_process(self, *args, **kwargs):
+        yield from super().post_process(*args, **kwargs)
+        for name in set(self.hashed_files.values()):
+            if PurePosixPath(name).suffix in COMPRESSIBLE_EXTENSIONS:
+                yield from self.compress(name)
+
+    def compress(self, name):
+        with self.open(name) as source:
+            data = source.read()
+        if len(data) < constants.STATIC_COMPRESS_MIN_SIZE:
+            return
+        for extension, compress in compressors():
+            compressed = compress(data)
+            if len(compressed) >= len(data):
+                continue
+            target = f"{name}{extension}"
+            if self.exists(target):
+                self.delete(target)
+            self._save(target, ContentFile(compressed))
+            yield name, target, True
@@ -0,0 +1,83 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def posts(mixer, user, published_category):
+    return mixer.cycle(5).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        location=None,
+        is_published=True,
+        pub_date=timezone.now() - timedelta(days=1),
+    )
+
+
+def test_posts_are_paged_with_cursors(client, posts):
+    seen = []
+    url = "/api/posts/?limit=2"
+    while url:
+        data = client.get(url).json()
+        seen.extend(item["id"] for item in data["results"])
+        url = data["next"]
+    assert seen == sorted((post.id for post in posts), reverse=True), (
+        "Убедитесь, что курсорная пагинация API возвращает все публикации "
+        "без пропусков и повторов."
+    )
+
+
+def test_fields_and_embed_in_one_query(
+    client, django_assert_max_num_queries, user, posts
+):
+    with django_assert_max_num_queries(3):
+        data = client.get(
+            "/api/posts/", {"fields": "id,title,author", "embed": "author"}
+        ).json()
+    item = data["results"][0]
+    assert set(item) == {"id", "title", "author"}, (
+        "Убедитесь, что параметр `fields` ограничивает поля ответа."
+    )
+    assert item["author"]["username"] == user.username, (
+        "Убедитесь, что параметр `embed` вкладывает данные автора."
+    )
+
+
+def test_api_rejects_unknown_fields(client, posts):
+    response = client.get("/api/posts/", {"fields": "id,password"})
+    assert response.status_code == 400
+
+
+def test_comments_of_hidden_post_are_not_found(client, mixer, user, posts):
+    hidden = posts[0]
+    hidden.is_published = False
+    hidden.save()
+    mixer.blend("blog.Comment", post=hidden, author=user)
+    response = client.get(f"/api/posts/{hidden.id}/comments/")
+    assert response.status_code == 404
+    response = client.get(f"/api/posts/{posts[1].id}/comments/")
+    assert response.json()["results"] == []
+
+
+def test_unpublished_location_is_hidden(
+    client, mixer, posts, published_location
+):
+    hidden = mixer.blend("blog.Location", is_published=False)
+    posts[0].location = hidden
+    posts[0].save()
+    posts[1].location = published_location
+    posts[1].save()
+    for query in ("fields=id,location", "fields=id,location&embed=location"):
+        results = {
+            item["id"]: item["location"]
+            for item in client.get(f"/api/posts/?{query}").json()["results"]
+        }
+        assert results[posts[0].id] is None, (
+            "Убедитесь, что API не раскрывает местоположения, снятые с "
+            "публикации."
+        )
+        assert results[posts[1].id] is not None
@@ -0,0 +1,122 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_post_card_follows_related_changes(
+    mixer, client, user, post_with_published_location
+):
+    post = post_with_published_location
+    assert post.title in client.get("/").content.decode()
+
+    post.category.title = "Обновлённая категория"
+    post.category.save()
+    post.author.username = "renamed_author"
+    post.author.save()
+    mixer.blend("blog.Comment", post=post, author=user)
+
+    content = client.get("/").content.decode()
+    assert "Обновлённая категория" in content, (
+        "Убедитесь, что карточка публикации обновляется при изменении "
+        "категории."
+    )
+    assert "@renamed_author" in content, (
+        "Убедитесь, что карточка публикации обновляется при изменении "
+        "автора."
+    )
+    assert "Комментарии (1)" in content, (
+        "Убедитесь, что карточка публикации обновляется при добавлении "
+        "комментария."
+    )
+
+
+def test_anonymous_page_cache_is_invalidated(
+    mixer, client, user, post_with_published_location
+):
+    post = post_with_published_location
+    url = f"/posts/{post.id}/"
+    client.get(url)
+    assert client.get(url).content == client.get(url).content
+
+    mixer.blend("blog.Comment", post=post, author=user, text="Новый отзыв")
+    assert "Новый отзыв" in client.get(url).content.decode(), (
+        "Убедитесь, что кэш страниц для анонимных посетителей сбрасывается "
+        "при добавлении комментария."
+    )
+
+
+def test_anonymous_page_cache_respects_page(
+    mixer, client, user, published_category
+):
+    mixer.cycle(15).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+    )
+    first = client.get("/").content
+    second = client.get("/", {"page": 2}).content
+    assert first != second, (
+        "Убедитесь, что кэш страниц учитывает параметр `page`."
+    )
+
+
+def test_feed_answers_not_modified(
+    mixer, user_client, user, post_with_published_location
+):
+    post = post_with_published_location
+    for url in ("/", f"/posts/{post.id}/"):
+        etag = user_client.get(url)["ETag"]
+        response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304, (
+            "Убедитесь, что страницы блога отвечают 304 Not Modified, "
+            "если содержимое не изменилось."
+        )
+
+    mixer.blend("blog.Comment", post=post, author=user)
+    response = user_client.get(f"/posts/{post.id}/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200, (
+        "Убедитесь, что ETag страницы публикации меняется при добавлении "
+        "комментария."
+    )
+
+
+def test_edit_changes_etag(client, user, post_with_published_location):
+    post = post_with_published_location
+    url = f"/profile/{user.username}/"
+    response = client.get(url)
+    assert "Last-Modified" not in response, (
+        "Убедитесь, что страницы не отдают Last-Modified, который не "
+        "учитывает правки публикаций."
+    )
+    etag = response["ETag"]
+
+    post.title = "Исправленный заголовок"
+    post.save()
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200, (
+        "Убедитесь, что ETag меняется при правке публикации."
+    )
+    assert "Исправленный заголовок" in response.content.decode()
+
+
+def test_not_modified_profile_reads_by_index(
+    user_client, user, post_with_published_location
+):
+    url = f"/profile/{user.username}/"
+    etag = user_client.get(url)["ETag"]
+    with CaptureQueriesContext(connection) as context:
+        response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    with connection.cursor() as cursor:
+        for query in context.captured_queries:
+            if "blog_post" not in query["sql"]:
+                continue
+            cursor.execute(f"EXPLAIN QUERY PLAN {query['sql']}")
+            plan = " ".join(row[-1] for row in cursor.fetchall())
+            assert "SCAN" not in plan and "TEMP B-TREE" not in plan, (
+                "Убедитесь, что ETag страницы пользователя считается по "
+                f"индексу, а не полным просмотром таблицы: {plan}"
+            )
@@ -0,0 +1,95 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.core.management import call_command
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def post(post_with_published_location):
+    return post_with_published_location
+
+
+def test_comment_count_follows_comments(mixer, user_client, user, post):
+    user_client.post(
+        f"/posts/{post.id}/comment/", data={"text": "Первый"}
+    )
+    second = mixer.blend("blog.Comment", post=post, author=user)
+    post.refresh_from_db()
+    assert post.comment_count == 2, (
+        "Убедитесь, что счётчик комментариев публикации увеличивается "
+        "при добавлении комментария."
+    )
+
+    user_client.post(f"/posts/{post.id}/delete_comment/{second.id}/")
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        "Убедитесь, что счётчик комментариев публикации уменьшается "
+        "при удалении комментария."
+    )
+
+
+def test_recount_comments_fixes_drift(mixer, user, post):
+    mixer.cycle(3).blend("blog.Comment", post=post, author=user)
+    type(post).objects.filter(pk=post.pk).update(comment_count=10)
+
+    call_command("recount_comments")
+
+    post.refresh_from_db()
+    assert post.comment_count == 3, (
+        "Убедитесь, что команда `recount_comments` восстанавливает "
+        "счётчики комментариев."
+    )
+
+
+def test_comment_count_never_goes_negative(mixer, user, post):
+    comment = mixer.blend("blog.Comment", post=post, author=user)
+    type(post).objects.filter(pk=post.pk).update(comment_count=0)
+
+    comment.delete()
+
+    post.refresh_from_db()
+    assert post.comment_count == 0, (
+        "Убедитесь, что удаление комментария не делает счётчик "
+        "отрицательным, даже если он разошёлся с реальным числом."
+    )
+
+
+def test_deleting_post_skips_comment_count_updates(mixer, user, post):
+    mixer.cycle(20).blend("blog.Comment", post=post, author=user)
+    with CaptureQueriesContext(connection) as context:
+        post.delete()
+    updates = [
+        query["sql"] for query in context.captured_queries
+        if query["sql"].startswith('UPDATE "blog_post"')
+    ]
+    assert not updates, (
+        "Убедитесь, что при удалении публикации счётчик комментариев не "
+        "обновляется для каждого удаляемого комментария."
+    )
+
+
+def test_comment_deletes_are_batched_per_post(
+    mixer, user, another_user, post
+):
+    other_post = mixer.blend(
+        "blog.Post", author=user, category=post.category
+    )
+    mixer.cycle(3).blend("blog.Comment", post=post, author=another_user)
+    mixer.cycle(2).blend("blog.Comment", post=other_post, author=another_user)
+    mixer.blend("blog.Comment", post=post, author=user)
+
+    with CaptureQueriesContext(connection) as context:
+        another_user.delete()
+
+    updates = [
+        query["sql"] for query in context.captured_queries
+        if query["sql"].startswith('UPDATE "blog_post"')
+    ]
+    assert len(updates) == 2, (
+        "Убедитесь, что счётчик каждой публикации сдвигается одним запросом."
+    )
+    post.refresh_from_db()
+    other_post.refresh_from_db()
+    assert (post.comment_count, other_post.comment_count) == (1, 0)
@@ -0,0 +1,77 @@
+import gzip
+import json
+
+import pytest
+from django.core.management import call_command
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def dataset(mixer, user, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(3).blend("blog.Comment", post=post, author=user)
+    return post
+
+
+def test_export_blog_writes_ndjson(tmp_path, dataset):
+    output = tmp_path / "blog.ndjson.gz"
+    call_command("export_blog", output=str(output), gzip=True, chunk_size=2)
+
+    with gzip.open(output, "rt") as file:
+        rows = [json.loads(line) for line in file]
+    models = [row["model"] for row in rows]
+    assert models == [
+        "auth.user",
+        "blog.category",
+        "blog.location",
+        "blog.post",
+        "blog.comment",
+        "blog.comment",
+        "blog.comment",
+    ], (
+        "Убедитесь, что выгрузка содержит все объекты блога в порядке "
+        "зависимостей."
+    )
+    assert "password" not in rows[0]["fields"], (
+        "Убедитесь, что пароли пользователей не попадают в выгрузку."
+    )
+    assert rows[3]["fields"]["author"] == dataset.author_id
+
+
+def test_export_blog_resumes_from_checkpoint(tmp_path, dataset):
+    output = tmp_path / "blog.ndjson"
+    call_command("export_blog", output=str(output))
+    complete = output.read_bytes()
+
+    lines = complete.splitlines(keepends=True)
+    post_line = next(i for i, line in enumerate(lines) if b"blog.post" in line)
+    offset = len(b"".join(lines[: post_line + 1]))
+    output.write_bytes(complete[:offset] + b'{"broken')
+    checkpoint = tmp_path / "checkpoint.json"
+    checkpoint.write_text(
+        json.dumps({"model": "blog.post", "pk": dataset.pk, "offset": offset})
+    )
+
+    call_command(
+        "export_blog", output=str(output), checkpoint=str(checkpoint)
+    )
+    assert output.read_bytes() == complete, (
+        "Убедитесь, что выгрузка продолжается с контрольной точки."
+    )
+    assert not checkpoint.exists()
+
+
+def test_admin_action_streams_selected_posts(admin_client, dataset):
+    response = admin_client.post(
+        "/admin/blog/post/",
+        {"action": "export_ndjson", "_selected_action": [dataset.pk]},
+    )
+    assert response.streaming
+    rows = [
+        json.loads(line)
+        for line in b"".join(response.streaming_content).splitlines()
+    ]
+    assert [row["pk"] for row in rows if row["model"] == "blog.post"] == [
+        dataset.pk
+    ]
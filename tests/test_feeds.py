@@ -0,0 +1,79 @@
+from xml.etree import ElementTree
+
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+
+
+@pytest.fixture
+def post(post_with_published_location):
+    return post_with_published_location
+
+
+def read(response):
+    assert response.status_code == 200
+    if response.streaming:
+        return b"".join(response.streaming_content)
+    return response.content
+
+
+def test_rss_feed_lists_published_posts(client, mixer, user, post):
+    mixer.blend("blog.Post", author=user, is_published=False)
+    response = client.get("/feeds/rss/")
+    assert response.streaming, (
+        "Убедитесь, что лента отдаётся потоком, по мере генерации записей."
+    )
+    items = ElementTree.fromstring(read(response)).findall("channel/item")
+    assert [item.findtext("title") for item in items] == [post.title], (
+        "Убедитесь, что в ленту попадают только опубликованные публикации."
+    )
+
+
+def test_category_and_author_atom_feeds(client, post):
+    for url in (
+        f"/feeds/atom/category/{post.category.slug}/",
+        f"/feeds/atom/profile/{post.author.username}/",
+    ):
+        feed = ElementTree.fromstring(read(client.get(url)))
+        entries = feed.findall(f"{ATOM}entry")
+        assert [entry.findtext(f"{ATOM}title") for entry in entries] == [
+            post.title
+        ], f"Убедитесь, что лента `{url}` содержит публикации."
+
+    post.category.is_published = False
+    post.category.save()
+    response = client.get(f"/feeds/atom/category/{post.category.slug}/")
+    assert response.status_code == 404
+
+
+def test_feed_is_cached_and_invalidated(client, post):
+    response = client.get("/feeds/rss/")
+    first = read(response)
+    etag = response["ETag"]
+    cached = client.get("/feeds/rss/")
+    assert not cached.streaming and read(cached) == first, (
+        "Убедитесь, что готовый XML ленты кэшируется."
+    )
+    assert client.get(
+        "/feeds/rss/", HTTP_IF_NONE_MATCH=etag
+    ).status_code == 304, (
+        "Убедитесь, что лента поддерживает условные GET-запросы."
+    )
+
+    post.title = "Новый заголовок"
+    post.save()
+    assert "Новый заголовок" in read(client.get("/feeds/rss/")).decode(), (
+        "Убедитесь, что кэш ленты сбрасывается при изменении публикации."
+    )
+
+
+def test_feed_cache_is_per_host(client, settings, post):
+    settings.ALLOWED_HOSTS = ["testserver", "mirror.example"]
+    assert b"http://testserver/" in read(client.get("/feeds/rss/"))
+    other = read(client.get("/feeds/rss/", HTTP_HOST="mirror.example"))
+    assert b"http://mirror.example/" in other, (
+        "Убедитесь, что закэшированная лента не отдаёт ссылки другого хоста."
+    )
+    assert b"http://testserver/" not in other
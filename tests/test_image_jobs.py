@@ -0,0 +1,180 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.utils import timezone
+from PIL import ExifTags, Image
+
+from blog.images import rendition_name
+from blog.jobs import claim_jobs
+from blog.models import ImageJob, Post
+from blogicum import constants
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path / "media"
+
+
+@pytest.fixture(autouse=True)
+def shared_cache(settings, tmp_path):
+    settings.CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": str(tmp_path / "cache"),
+        }
+    }
+
+
+def jpeg(size, orientation=None):
+    exif = Image.Exif()
+    if orientation:
+        exif[ExifTags.Base.Orientation] = orientation
+    buffer = BytesIO()
+    Image.new("RGB", size, color=(73, 109, 137)).save(
+        buffer, "JPEG", exif=exif
+    )
+    return buffer.getvalue()
+
+
+def process_jobs():
+    call_command("process_image_jobs", once=True, processes=1)
+
+
+def test_upload_enqueues_job(user_client, user, published_category):
+    response = user_client.post(
+        "/posts/create/",
+        data={
+            "title": "Заголовок",
+            "text": "Текст",
+            "pub_date": timezone.now().strftime("%Y-%m-%dT%H:%M"),
+            "category": published_category.id,
+            "is_published": True,
+            "image": SimpleUploadedFile(
+                "photo.jpg", jpeg((100, 100)), content_type="image/jpeg"
+            ),
+        },
+    )
+    assert response.status_code == 302
+    post = Post.objects.get(author=user)
+    job = ImageJob.objects.get()
+    assert (job.post, job.image, job.status) == (
+        post, post.image.name, ImageJob.PENDING
+    ), "Убедитесь, что загруженная картинка ставится в очередь."
+
+
+def test_jobs_are_claimed_once(mixer, post_with_published_location):
+    ImageJob.objects.all().delete()
+    jobs = mixer.cycle(3).blend(
+        ImageJob, post=post_with_published_location, status=ImageJob.PENDING
+    )
+    claimed = claim_jobs(2)
+    assert [job.pk for job in claimed] == [job.pk for job in jobs[:2]]
+    assert claim_jobs(5) == [jobs[2]], (
+        "Убедитесь, что взятое задание не выдаётся повторно."
+    )
+    assert set(
+        ImageJob.objects.values_list("status", "attempts")
+    ) == {(ImageJob.RUNNING, 1)}
+
+
+def test_failing_job_is_retried_then_failed(
+    mixer, post_with_published_location
+):
+    ImageJob.objects.all().delete()
+    storage = Post._meta.get_field("image").storage
+    name = storage.save("post_images/broken.jpg", ContentFile(b"not image"))
+    job = mixer.blend(
+        ImageJob, post=post_with_published_location, image=name,
+        status=ImageJob.PENDING, attempts=0,
+    )
+    process_jobs()
+    job.refresh_from_db()
+    assert (job.status, job.attempts) == (
+        ImageJob.FAILED, constants.IMAGE_JOB_MAX_ATTEMPTS
+    ), (
+        "Убедитесь, что задание повторяется и после последней попытки "
+        "помечается как неудачное."
+    )
+    assert job.error
+
+
+def test_exif_rotated_image_is_normalized(mixer, user, published_category):
+    post = mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        image=ContentFile(jpeg((1000, 700), orientation=6), "photo.jpg"),
+    )
+    original = post.image.name
+    process_jobs()
+
+    post.refresh_from_db()
+    job = ImageJob.objects.get(post=post)
+    assert job.status == ImageJob.DONE
+    assert post.image.name != original
+    with post.image.open() as file:
+        image = Image.open(file)
+        assert image.size == (700, 1000), (
+            "Убедитесь, что картинка поворачивается по EXIF."
+        )
+        assert ExifTags.Base.Orientation not in image.getexif()
+    storage = post.image.storage
+    assert storage.exists(rendition_name(post.image.name, "card"))
+
+
+def test_upright_image_is_not_saved_again(mixer, user, published_category):
+    post = mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        image=ContentFile(jpeg((700, 500)), "photo.jpg"),
+    )
+    original = post.image.name
+    process_jobs()
+
+    post.refresh_from_db()
+    assert post.image.name == original, (
+        "Убедитесь, что картинка без поворота не пересохраняется."
+    )
+    assert ImageJob.objects.get(post=post).status == ImageJob.DONE
+
+
+def test_worker_requires_shared_cache(settings):
+    settings.CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+    with pytest.raises(CommandError):
+        process_jobs()
+
+
+def test_finished_job_refreshes_cached_cards(
+    client, mixer, user, published_category
+):
+    post = mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=timezone.now(),
+        image=ContentFile(jpeg((1000, 700), orientation=6), "photo.jpg"),
+    )
+    response = client.get("/")
+    etag = response["ETag"]
+    assert "srcset" not in response.content.decode()
+    process_jobs()
+
+    post.refresh_from_db()
+    response = client.get("/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    content = response.content.decode()
+    assert post.image.url in content and "srcset" in content, (
+        "Убедитесь, что после обработки картинки карточки и страницы "
+        "показывают новую картинку и её копии."
+    )
@@ -0,0 +1,80 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.base import ContentFile
+from PIL import Image
+
+from blog.images import (
+    delete_image,
+    has_renditions,
+    image_srcset,
+    make_renditions,
+    rendition_name,
+)
+from blog.models import Post
+
+
+@pytest.fixture
+def storage(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return Post._meta.get_field("image").storage
+
+
+def save_image(storage, size, name="post_images/photo.png"):
+    buffer = BytesIO()
+    Image.new("RGB", size, color=(73, 109, 137)).save(buffer, "PNG")
+    return storage.save(name, ContentFile(buffer.getvalue()))
+
+
+def test_renditions_have_exact_widths(storage):
+    name = save_image(storage, (1000, 2000))
+    assert make_renditions(storage, name) == {"card": 640, "detail": 960}
+    stem = name.rsplit(".", 1)[0]
+    assert rendition_name(name, "card") == f"{stem}_card.jpg"
+    for kind, size in (("card", (640, 1280)), ("detail", (960, 1920))):
+        with storage.open(rendition_name(name, kind)) as file:
+            assert Image.open(file).size == size, (
+                "Убедитесь, что копии картинки имеют заявленную ширину."
+            )
+    assert not storage.exists(rendition_name(name, "retina")), (
+        "Убедитесь, что копии шире оригинала не создаются."
+    )
+
+
+def test_small_image_has_no_renditions(storage):
+    name = save_image(storage, (300, 200))
+    assert make_renditions(storage, name) == {}
+    assert image_srcset(Post(image=name).image) == ""
+
+
+def test_srcset_lists_ready_renditions(storage, monkeypatch):
+    name = save_image(storage, (2000, 1000))
+    make_renditions(storage, name)
+    monkeypatch.setattr(
+        storage,
+        "exists",
+        lambda name: pytest.fail("srcset не должен проверять файлы"),
+    )
+    url = f"/media/{name.rsplit('.', 1)[0]}"
+    assert image_srcset(Post(image=name).image) == (
+        f"{url}_card.jpg 640w, {url}_detail.jpg 960w, {url}_retina.jpg 1920w"
+    ), "Убедитесь, что srcset перечисляет готовые копии с их шириной."
+
+
+def test_legacy_image_renditions_live_next_to_it(storage, tmp_path):
+    buffer = BytesIO()
+    Image.new("RGB", (800, 600)).save(buffer, "JPEG")
+    name = storage.save_derived(
+        "post_images/legacy.jpg", ContentFile(buffer.getvalue())
+    )
+    assert make_renditions(storage, name) == {"card": 640}
+    assert storage.exists("post_images/legacy_card.jpg"), (
+        "Убедитесь, что копии картинки со старым именем сохраняются рядом "
+        "с ней, а не под именем из хэша."
+    )
+    assert has_renditions(storage, name)
+
+    delete_image(storage, name)
+    assert not [path for path in tmp_path.rglob("*") if path.is_file()], (
+        "Убедитесь, что удаление картинки не оставляет лишних файлов."
+    )
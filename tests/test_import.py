@@ -0,0 +1,95 @@
+from datetime import timedelta
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+
+from blog.models import Category, Comment, Location, Post, User
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_import_blog_loads_fixture(client):
+    call_command("import_blog", str(settings.BASE_DIR / "blog.json"))
+
+    assert (
+        User.objects.count(),
+        Category.objects.count(),
+        Location.objects.count(),
+        Post.objects.count(),
+    ) == (4, 6, 12, 39), (
+        "Убедитесь, что команда `import_blog` загружает пользователей, "
+        "категории, местоположения и публикации из фикстуры."
+    )
+    post = Post.objects.get(pk=1)
+    response = client.get("/search/", {"q": post.title})
+    assert post in response.context["page_obj"], (
+        "Убедитесь, что загруженные публикации попадают в поисковый индекс."
+    )
+
+
+def test_import_blog_round_trips_export(
+    tmp_path, mixer, user, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.cycle(2).blend("blog.Comment", post=post, author=user)
+    # Выгрузка хранит время с точностью до миллисекунд.
+    created_at = post.created_at.replace(microsecond=0) - timedelta(days=30)
+    Post.objects.filter(pk=post.pk).update(created_at=created_at)
+    for minutes, comment in enumerate(Comment.objects.all()):
+        comment.created_at = created_at + timedelta(minutes=minutes)
+        comment.save(update_fields=["created_at"])
+    created = {
+        comment.pk: comment.created_at for comment in Comment.objects.all()
+    }
+    post.refresh_from_db()
+    dump = tmp_path / "blog.ndjson.gz"
+    call_command("export_blog", output=str(dump), gzip=True)
+
+    Post.objects.all().delete()
+    call_command("import_blog", str(dump), batch_size=1)
+
+    imported = Post.objects.get(pk=post.pk)
+    assert imported.author == user, (
+        "Убедитесь, что существующие пользователи сопоставляются по имени."
+    )
+    assert imported.comment_count == 2, (
+        "Убедитесь, что после загрузки пересчитываются счётчики комментариев."
+    )
+    assert imported.created_at == post.created_at and created == {
+        comment.pk: comment.created_at for comment in Comment.objects.all()
+    }, "Убедитесь, что загрузка сохраняет исходные `created_at`."
+    assert Location.objects.count() == 1, (
+        "Убедитесь, что совпадающие записи не загружаются повторно."
+    )
+
+
+def test_import_blog_remaps_taken_pks(
+    tmp_path, mixer, user, post_with_published_location
+):
+    post = post_with_published_location
+    dump = tmp_path / "blog.ndjson"
+    call_command("export_blog", output=str(dump))
+    author_pk, category_pk, location_pk = (
+        user.pk, post.category_id, post.location_id
+    )
+    username = user.username
+    User.objects.all().delete()
+    Location.objects.all().delete()
+    alice = mixer.blend(User, pk=author_pk, username="alice")
+    other_location = mixer.blend(Location, pk=location_pk, name="Другое")
+    other_post = mixer.blend(
+        Post, pk=post.pk, author=alice, location=other_location,
+        category_id=category_pk,
+    )
+
+    call_command("import_blog", str(dump))
+
+    imported = Post.objects.exclude(pk=other_post.pk).get()
+    assert imported.author.username == username, (
+        "Убедитесь, что пользователь с занятым pk получает новый pk, а не "
+        "подменяется чужой записью."
+    )
+    assert imported.location != other_location
+    assert imported.location.name == post.location.name
+    assert Post.objects.get(pk=other_post.pk).author == alice
@@ -0,0 +1,88 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def many_posts(mixer, user, published_category):
+    pub_date = timezone.now() - timedelta(days=1)
+    return mixer.cycle(N_PER_PAGE * 2 + 5).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=pub_date,
+    )
+
+
+def test_cursor_pages_cover_feed(client, many_posts):
+    seen = []
+    url = "?after="
+    response = client.get("/", {"after": "invalid"})
+    page_obj = response.context["page_obj"]
+    while True:
+        seen.extend(post.id for post in page_obj)
+        assert len(page_obj) <= N_PER_PAGE, (
+            "Убедитесь, что курсорная страница содержит не больше "
+            f"{N_PER_PAGE} публикаций."
+        )
+        if not page_obj.has_next():
+            break
+        assert f"{url}{page_obj.next_cursor}" in response.content.decode(), (
+            "Убедитесь, что пагинатор выводит ссылку на следующую страницу "
+            "курсорной пагинации."
+        )
+        response = client.get("/", {"after": page_obj.next_cursor})
+        page_obj = response.context["page_obj"]
+    expected = sorted(
+        (post.id for post in many_posts), reverse=True
+    )
+    assert seen == expected, (
+        "Убедитесь, что курсорная пагинация возвращает все публикации "
+        "ленты без пропусков и повторов."
+    )
+
+    response = client.get("/", {"before": page_obj.previous_cursor})
+    previous_page = [post.id for post in response.context["page_obj"]]
+    assert previous_page == expected[N_PER_PAGE:N_PER_PAGE * 2], (
+        "Убедитесь, что курсор `before` возвращает предыдущую страницу."
+    )
+
+
+def test_page_number_still_supported(client, many_posts):
+    response = client.get("/", {"page": 3})
+    assert response.status_code == 200
+    assert len(response.context["page_obj"]) == 5, (
+        "Убедитесь, что постраничная пагинация по параметру `page` "
+        "продолжает работать."
+    )
+
+
+def test_comments_are_served_in_batches(
+    mixer, client, user, post_with_published_location
+):
+    post = post_with_published_location
+    comments = mixer.cycle(25).blend("blog.Comment", post=post, author=user)
+
+    response = client.get(f"/posts/{post.id}/")
+    first_batch = response.context["comments"]
+    assert [c.id for c in first_batch] == [c.id for c in comments[:20]], (
+        "Убедитесь, что на странице публикации выводится первая порция "
+        "комментариев, от старых к новым."
+    )
+
+    response = client.get(
+        f"/posts/{post.id}/comments/", {"after": first_batch.next_cursor}
+    )
+    assert response.status_code == 200
+    assert [c.id for c in response.context["comments"]] == [
+        c.id for c in comments[20:]
+    ], (
+        "Убедитесь, что фрагмент комментариев возвращает следующую "
+        "порцию комментариев."
+    )
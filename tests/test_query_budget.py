@@ -0,0 +1,67 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def feed(mixer, user, published_category, published_location):
+    pub_date = timezone.now() - timedelta(days=1)
+    posts = mixer.cycle(N_PER_PAGE * 2).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        location=published_location,
+        is_published=True,
+        pub_date=pub_date,
+    )
+    mixer.cycle(N_PER_PAGE).blend("blog.Comment", post=posts[0], author=user)
+    return posts
+
+
+@pytest.mark.parametrize(
+    "url, budget",
+    [
+        (lambda posts: "/", 3),
+        (lambda posts: f"/profile/{posts[0].author.username}/", 4),
+        (lambda posts: f"/category/{posts[0].category.slug}/", 4),
+        (lambda posts: f"/posts/{posts[0].id}/", 3),
+    ],
+    ids=["index", "profile", "category_posts", "post_detail"],
+)
+def test_blog_views_query_budget(
+    django_assert_max_num_queries, user_client, feed, url, budget
+):
+    # Сессия и пользователь запроса добавляют ещё два запроса.
+    with django_assert_max_num_queries(budget + 2):
+        response = user_client.get(url(feed))
+    assert response.status_code == 200
+
+
+def test_feed_queries_use_indexes(feed, mixer, another_user):
+    mixer.blend("blog.Post", author=another_user, is_published=False)
+    out = StringIO()
+    call_command("explain_feeds", repeat=1, stdout=out)
+    plans = out.getvalue()
+    assert "post_author_feed_idx" in plans, (
+        "Убедитесь, что страница пользователя читает публикации по "
+        "индексу автора."
+    )
+    assert "SCAN blog_post" not in plans and "TEMP B-TREE" not in plans
+
+
+def test_profile_lists_only_author_posts(user_client, user, mixer, feed):
+    hidden = mixer.blend(
+        "blog.Post", is_published=False, pub_date=timezone.now()
+    )
+    response = user_client.get(f"/profile/{user.username}/")
+    assert hidden not in response.context["page_obj"], (
+        "Убедитесь, что на странице пользователя нет неопубликованных "
+        "публикаций других авторов."
+    )
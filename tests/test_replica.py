@@ -0,0 +1,162 @@
+from datetime import timedelta
+
+import pytest
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import resolve
+
+from blog.models import Post
+from blog import utils
+from blog.utils import read_only_view
+from blogicum import constants, middleware, routers
+from blogicum.middleware import ReplicaMiddleware
+
+
+@pytest.fixture
+def replica(monkeypatch):
+    monkeypatch.setattr(middleware, "replica_configured", lambda: True)
+    monkeypatch.setattr(routers, "replica_lag", lambda: timedelta())
+
+
+@pytest.fixture
+def mirror(monkeypatch):
+    """Подключает псевдоним как зеркало default, как ``TEST.MIRROR``."""
+    added = []
+
+    def add(alias):
+        monkeypatch.setitem(
+            settings.DATABASES,
+            alias,
+            {
+                **settings.DATABASES[DEFAULT_DB_ALIAS],
+                "TEST": {"MIRROR": DEFAULT_DB_ALIAS},
+            },
+        )
+        connections[alias] = connections[DEFAULT_DB_ALIAS]
+        added.append(alias)
+
+    yield add
+    for alias in added:
+        del connections[alias]
+
+
+def handle(request):
+    """Проводит запрос через middleware и возвращает базу чтения во view."""
+    seen = []
+
+    def view(request):
+        replica_middleware.process_view(request, None, (), {})
+        seen.append(routers.read_alias.get())
+        return HttpResponse()
+
+    replica_middleware = ReplicaMiddleware(view)
+    request.resolver_match = resolve(request.path)
+    response = replica_middleware(request)
+    assert routers.read_alias.get() is None, (
+        "Убедитесь, что выбор реплики сбрасывается после запроса."
+    )
+    return seen[0], response
+
+
+def test_get_reads_from_replica(replica):
+    alias, _ = handle(RequestFactory().get("/"))
+    assert alias == "replica", (
+        "Убедитесь, что GET-запросы к блогу читают из реплики."
+    )
+
+
+def test_write_pins_reads_to_primary(replica):
+    _, response = handle(RequestFactory().post("/posts/create/"))
+    assert constants.REPLICA_PIN_COOKIE in response.cookies, (
+        "Убедитесь, что после записи чтение закрепляется за основной базой."
+    )
+
+    request = RequestFactory().get("/")
+    request.COOKIES[constants.REPLICA_PIN_COOKIE] = "1"
+    alias, _ = handle(request)
+    assert alias is None
+
+
+def test_lagging_replica_is_skipped(replica, monkeypatch):
+    monkeypatch.setattr(
+        routers,
+        "replica_lag",
+        lambda: timedelta(seconds=constants.REPLICA_MAX_LAG + 1),
+    )
+    alias, _ = handle(RequestFactory().get("/"))
+    assert alias is None, (
+        "Убедитесь, что при отставании реплики чтение идёт из основной базы."
+    )
+
+
+def test_admin_is_not_routed(replica):
+    alias, _ = handle(RequestFactory().get("/admin/"))
+    assert alias is None
+
+
+@pytest.mark.django_db
+def test_replica_middleware_routes_querysets(mirror, mixer):
+    mirror(routers.REPLICA_ALIAS)
+    post = mixer.blend("blog.Post")
+    seen = []
+
+    def view(request):
+        replica_middleware.process_view(request, None, (), {})
+        queryset = Post.objects.all()
+        seen.append((queryset.db, list(queryset)))
+        return HttpResponse()
+
+    replica_middleware = ReplicaMiddleware(view)
+    request = RequestFactory().get("/")
+    request.resolver_match = resolve(request.path)
+    replica_middleware(request)
+    assert seen == [("replica", [post])], (
+        "Убедитесь, что запросы к моделям во view читают из реплики."
+    )
+    assert Post.objects.all().db == DEFAULT_DB_ALIAS
+
+
+@pytest.mark.django_db
+def test_read_only_view_routes_querysets(mirror, mixer):
+    mirror(routers.READ_ONLY_ALIAS)
+    post = mixer.blend("blog.Post")
+    seen = []
+
+    @read_only_view
+    def view(request):
+        queryset = Post.objects.all()
+        seen.append((queryset.db, list(queryset)))
+        return HttpResponse()
+
+    view(RequestFactory().get("/"))
+    view(RequestFactory().post("/"))
+    assert seen == [("readonly", [post]), (DEFAULT_DB_ALIAS, [post])], (
+        "Убедитесь, что read_only_view читает GET-запросы из readonly."
+    )
+
+
+@pytest.mark.django_db
+def test_replica_pages_are_cached_briefly(
+    mirror, client, monkeypatch, post_with_published_location
+):
+    mirror(routers.REPLICA_ALIAS)
+    timeouts = []
+    set_page = utils.cache.set
+
+    def record(key, value, timeout):
+        if key.startswith("blog:page:"):
+            timeouts.append(timeout)
+        set_page(key, value, timeout)
+
+    monkeypatch.setattr(utils.cache, "set", record)
+    client.get("/")
+    assert timeouts == [constants.REPLICA_MAX_LAG], (
+        "Убедитесь, что страница из реплики кэшируется не дольше "
+        "допустимого отставания реплики."
+    )
+
+    client.cookies[constants.REPLICA_PIN_COOKIE] = "1"
+    client.get("/", {"page": 1})
+    assert timeouts[-1] > constants.REPLICA_MAX_LAG
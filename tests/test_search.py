@@ -0,0 +1,81 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog import search
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(params=["fts5", "orm"])
+def index_backend(request, monkeypatch):
+    if request.param == "orm":
+        monkeypatch.setattr(search, "fts_enabled", lambda using=None: False)
+    return request.param
+
+
+@pytest.fixture
+def blend_post(mixer, user, published_category, index_backend):
+    def blend(**kwargs):
+        fields = {
+            "author": user,
+            "category": published_category,
+            "is_published": True,
+            "pub_date": timezone.now() - timedelta(days=1),
+            **kwargs,
+        }
+        return mixer.blend("blog.Post", **fields)
+
+    return blend
+
+
+def found(client, query):
+    response = client.get("/search/", {"q": query})
+    assert response.status_code == 200
+    return [post.id for post in response.context["page_obj"]]
+
+
+def test_search_matches_word_forms_and_ranks_title(client, blend_post):
+    in_text = blend_post(title="Заметка", text="Кот гулял по крышам.")
+    in_title = blend_post(title="Коты на крыше", text="Без подробностей.")
+    blend_post(title="Собаки", text="Собаки гуляют во дворе.")
+
+    assert found(client, "котов крыша") == [in_title.id, in_text.id], (
+        "Убедитесь, что поиск находит разные формы слов и ставит выше "
+        "публикации, где слова встречаются в заголовке."
+    )
+    assert found(client, "кот собаки") == [], (
+        "Убедитесь, что поиск возвращает публикации со всеми словами запроса."
+    )
+
+
+def test_search_index_follows_changes(client, blend_post):
+    post = blend_post(title="Осень", text="Листья падают.")
+    blend_post(title="Черновик про листья", is_published=False)
+    assert found(client, "листьев") == [post.id], (
+        "Убедитесь, что поиск показывает только опубликованные публикации."
+    )
+
+    post.text = "Снег идёт."
+    post.save()
+    assert found(client, "листья") == []
+    assert found(client, "снег") == [post.id], (
+        "Убедитесь, что индекс обновляется при изменении публикации."
+    )
+
+    post.delete()
+    assert found(client, "снег") == []
+
+
+def test_rebuild_search_index(client, blend_post):
+    post = blend_post(title="Море", text="Волны и чайки.")
+    search.clear_index()
+    assert found(client, "чайки") == []
+
+    call_command("rebuild_search_index")
+    assert found(client, "чайки") == [post.id], (
+        "Убедитесь, что команда `rebuild_search_index` восстанавливает "
+        "поисковый индекс."
+    )
@@ -0,0 +1,47 @@
+import pytest
+from django.core.management import call_command
+from django.db.models import F, Sum
+
+from blog.models import Comment, Post, User
+
+pytestmark = [pytest.mark.django_db]
+
+SIZES = {
+    "users": 3,
+    "categories": 2,
+    "locations": 2,
+    "posts": 30,
+    "comments": 60,
+    "processes": 1,
+}
+
+
+def test_seed_blog_is_deterministic():
+    call_command("seed_blog", seed=5, **SIZES)
+    first = list(Post.objects.order_by("pk").values_list("title", flat=True))
+    call_command("seed_blog", seed=5, **SIZES)
+    second = list(
+        Post.objects.order_by("pk").values_list("title", flat=True)
+    )[len(first):]
+
+    assert first == second, (
+        "Убедитесь, что при одинаковом `--seed` генерируются одинаковые "
+        "данные."
+    )
+    assert Comment.objects.count() == 120
+    total = Post.objects.aggregate(total=Sum("comment_count"))["total"]
+    assert total == 120, (
+        "Убедитесь, что после генерации пересчитываются счётчики комментариев."
+    )
+    assert not any(user.has_usable_password() for user in User.objects.all())
+
+
+def test_seeded_comments_follow_their_posts():
+    call_command("seed_blog", seed=3, future_share=0.5, **SIZES)
+    anchor = Post.objects.order_by("created_at").last().created_at
+    assert not Comment.objects.filter(
+        created_at__lt=F("post__pub_date")
+    ).exists(), "Убедитесь, что комментарии не старше своих публикаций."
+    assert not Comment.objects.filter(post__pub_date__gt=anchor).exists(), (
+        "Убедитесь, что у отложенных публикаций нет комментариев."
+    )
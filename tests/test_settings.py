@@ -0,0 +1,32 @@
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+
+
+def import_settings(**env):
+    environ = {
+        key: value
+        for key, value in os.environ.items()
+        if not key.startswith("DJANGO_")
+    }
+    return subprocess.run(
+        [sys.executable, "-c", "import blogicum.settings"],
+        cwd=settings.BASE_DIR,
+        env={**environ, **env},
+        capture_output=True,
+        text=True,
+    )
+
+
+def test_production_requires_secret_key():
+    result = import_settings(DJANGO_DEBUG="0")
+    assert result.returncode != 0 and "DJANGO_SECRET_KEY" in result.stderr, (
+        "Убедитесь, что без отладки проект не запускается с ключом из "
+        "репозитория."
+    )
+    assert import_settings(
+        DJANGO_DEBUG="0", DJANGO_SECRET_KEY="production-key"
+    ).returncode == 0
+    assert import_settings().returncode == 0
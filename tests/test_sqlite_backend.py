@@ -0,0 +1,63 @@
+import pytest
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections
+
+from blogicum.sqlite.base import DatabaseWrapper
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def open_database(tmp_path):
+    """Открывает файловую базу через бэкенд проекта с заданными OPTIONS."""
+    opened = []
+
+    def open_(alias, **options):
+        wrapper = DatabaseWrapper(
+            {
+                **connections[DEFAULT_DB_ALIAS].settings_dict,
+                "NAME": str(tmp_path / "db.sqlite3"),
+                "OPTIONS": options,
+            },
+            alias,
+        )
+        opened.append(wrapper)
+        return wrapper
+
+    yield open_
+    for wrapper in opened:
+        wrapper.close()
+
+
+def pragma(wrapper, name):
+    with wrapper.cursor() as cursor:
+        cursor.execute(f"PRAGMA {name}")
+        return cursor.fetchone()[0]
+
+
+def test_backend_applies_pragmas(open_database):
+    wrapper = open_database("pragmas_test", pragmas={"cache_size": -4096})
+    assert pragma(wrapper, "journal_mode") == "wal", (
+        "Убедитесь, что бэкенд включает журнал WAL."
+    )
+    assert pragma(wrapper, "synchronous") == 1
+    assert pragma(wrapper, "busy_timeout") == 5000
+    assert pragma(wrapper, "temp_store") == 2
+    assert pragma(wrapper, "cache_size") == -4096, (
+        "Убедитесь, что OPTIONS['pragmas'] дополняет PRAGMA по умолчанию."
+    )
+    assert pragma(wrapper, "query_only") == 0
+
+
+def test_read_only_connection_refuses_writes(open_database):
+    writer = open_database("writer_test")
+    with writer.cursor() as cursor:
+        cursor.execute("CREATE TABLE note (text TEXT)")
+        cursor.execute("INSERT INTO note VALUES ('x')")
+
+    reader = open_database("readonly_test", read_only=True)
+    assert pragma(reader, "query_only") == 1
+    with reader.cursor() as cursor:
+        cursor.execute("SELECT text FROM note")
+        assert cursor.fetchall() == [("x",)]
+        with pytest.raises(OperationalError):
+            cursor.execute("INSERT INTO note VALUES ('y')")
@@ -0,0 +1,43 @@
+import gzip
+
+import pytest
+
+
+@pytest.fixture
+def static_root(settings, tmp_path):
+    settings.STATIC_ROOT = tmp_path
+    settings.SERVE_STATIC = True
+    css = tmp_path / "css"
+    css.mkdir()
+    content = b"body { color: black; }\n" * 50
+    (css / "site.0123456789ab.css").write_bytes(content)
+    (css / "site.0123456789ab.css.gz").write_bytes(gzip.compress(content))
+    (css / "site.css").write_bytes(content)
+    return tmp_path
+
+
+def test_hashed_static_is_compressed_and_immutable(client, static_root):
+    response = client.get(
+        "/static/css/site.0123456789ab.css", HTTP_ACCEPT_ENCODING="gzip"
+    )
+    assert response.status_code == 200
+    assert response["Content-Encoding"] == "gzip", (
+        "Убедитесь, что клиенту, принимающему gzip, отдаётся сжатая копия "
+        "статического файла."
+    )
+    assert "immutable" in response["Cache-Control"], (
+        "Убедитесь, что файлы с хэшем в имени кэшируются навсегда."
+    )
+    assert response["Content-Type"].startswith("text/css")
+
+
+def test_unhashed_static_is_not_immutable(client, static_root):
+    response = client.get("/static/css/site.css")
+    assert response.status_code == 200
+    assert not response.has_header("Content-Encoding")
+    assert "immutable" not in response["Cache-Control"]
+
+
+def test_static_path_traversal_is_rejected(client, static_root):
+    response = client.get("/static/../conftest.py")
+    assert response.status_code == 404
@@ -0,0 +1,103 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.utils import timezone
+from PIL import Image
+
+from blogicum import constants
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+
+
+def make_upload(size, image_format="PNG"):
+    buffer = BytesIO()
+    Image.new("1", size).save(buffer, image_format)
+    return SimpleUploadedFile(
+        f"upload.{image_format.lower()}",
+        buffer.getvalue(),
+        content_type=f"image/{image_format.lower()}",
+    )
+
+
+def post_data(published_category, image):
+    return {
+        "title": "Заголовок",
+        "text": "Текст",
+        "pub_date": timezone.now().strftime("%Y-%m-%dT%H:%M"),
+        "category": published_category.id,
+        "is_published": True,
+        "image": image,
+    }
+
+
+def test_huge_dimensions_are_rejected(user_client, published_category):
+    response = user_client.post(
+        "/posts/create/",
+        data=post_data(published_category, make_upload((10000, 5000))),
+    )
+    assert response.status_code == 200
+    assert response.context["form"].errors.get("image"), (
+        "Убедитесь, что форма публикации отклоняет картинки, число "
+        "пикселей в которых превышает допустимое."
+    )
+
+
+def test_oversized_file_is_rejected(
+    monkeypatch, user_client, published_category
+):
+    monkeypatch.setattr(constants, "MAX_IMAGE_SIZE", 100)
+    response = user_client.post(
+        "/posts/create/",
+        data=post_data(published_category, make_upload((100, 100), "BMP")),
+    )
+    assert response.status_code == 200
+    assert response.context["form"].errors.get("image"), (
+        "Убедитесь, что форма публикации отклоняет слишком большие файлы."
+    )
+
+
+def test_regular_image_is_accepted(user_client, published_category):
+    response = user_client.post(
+        "/posts/create/",
+        data=post_data(published_category, make_upload((100, 100))),
+    )
+    assert response.status_code == 302
+
+
+def test_identical_images_are_stored_once(
+    mixer, user, published_category, django_capture_on_commit_callbacks
+):
+    posts = [
+        mixer.blend(
+            "blog.Post",
+            author=user,
+            category=published_category,
+            image=make_upload((120, 80)),
+        )
+        for _ in range(2)
+    ]
+    name = posts[0].image.name
+    storage = posts[0].image.storage
+    assert posts[1].image.name == name, (
+        "Убедитесь, что одинаковые картинки сохраняются в один файл."
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        posts[0].delete()
+    assert storage.exists(name), (
+        "Убедитесь, что файл картинки не удаляется, пока на него "
+        "ссылаются другие публикации."
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        posts[1].delete()
+    assert not storage.exists(name), (
+        "Убедитесь, что файл картинки удаляется вместе с последней "
+        "публикацией, которая на него ссылается."
+    )